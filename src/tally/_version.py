@@ -67,6 +67,43 @@ def check_for_updates(timeout: float = 2.0) -> dict | None:
         return None
 
 
+def maybe_check_for_updates(interval_hours: float = 24.0, timeout: float = 2.0) -> dict | None:
+    """Run check_for_updates at most once per interval.
+
+    The last result is cached as JSON in ~/.cache/tally/last_check, so
+    invocations within the interval return the cached answer from a
+    single stat+read instead of a network round-trip.
+    Returns the check result, or None if unknown or the check fails.
+    """
+    import json
+    import os
+    import time
+
+    cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'tally')
+    stamp = os.path.join(cache_dir, 'last_check')
+    try:
+        if time.time() - os.stat(stamp).st_mtime < interval_hours * 3600:
+            try:
+                with open(stamp, encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None  # Empty/corrupt cache - treat as "no update"
+    except OSError:
+        pass  # No stamp yet - check now
+
+    result = check_for_updates(timeout=timeout)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(stamp, 'w', encoding='utf-8') as f:
+            if result is not None:
+                json.dump(result, f)
+    except OSError:
+        pass  # Unwritable cache dir - the check still ran
+
+    return result
+
+
 def _version_greater(v1: str, v2: str) -> bool:
     """Return True if v1 > v2 using semantic versioning comparison.
 
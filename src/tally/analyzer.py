@@ -391,8 +391,6 @@ def export_json(stats, verbose=0, category_filter=None, merchant_filter=None):
 
     Returns: JSON string
     """
-    import json
-
     by_merchant = stats.get('by_merchant', {})
     by_month = stats.get('by_month', {})
     by_category = stats.get('by_category', {})
@@ -677,9 +675,6 @@ def print_summary(stats, title=None, filter_category=None, currency_format="${am
         currency_format: Format string for currency
         group_by: How to group in BY CATEGORY section - 'merchant' or 'subcategory'
     """
-    # Import colors for terminal output
-    from .colors import C
-
     # Local helper for currency formatting
     def fmt(amount):
         return format_currency(amount, currency_format)
@@ -850,9 +845,6 @@ def print_sections_summary(stats, title=None, currency_format="${amount}", only_
         currency_format: Format string for currency
         only_filter: Optional list of section names (lowercase) to show
     """
-    # Import colors for terminal output
-    from .colors import C
-
     def fmt(amount):
         return format_currency(amount, currency_format)
 
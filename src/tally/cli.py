@@ -11,24 +11,8 @@ Usage:
 import argparse
 import sys
 
-from .colors import C
-from ._version import (
-    VERSION, GIT_SHA, REPO_URL, check_for_updates,
-)
 
-
-def main():
-    """Main entry point for tally CLI."""
-    parser = argparse.ArgumentParser(
-        prog='tally',
-        description='A tool to help agents classify your bank transactions.',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='''Run 'tally workflow' to see next steps based on your current state.'''
-    )
-
-    subparsers = parser.add_subparsers(dest='command', title='commands', metavar='<command>')
-
-    # init subcommand
+def _add_init_parser(subparsers):
     init_parser = subparsers.add_parser(
         'init',
         help='Set up a new budget folder with config files (run once to get started)'
@@ -40,76 +24,82 @@ def main():
         help='Directory to initialize (default: ./tally)'
     )
 
-    # up subcommand (primary command)
-    up_parser = subparsers.add_parser(
-        'up',
-        help='Parse transactions, categorize them, and generate HTML spending report'
-    )
-    up_parser.add_argument(
+
+def _add_shared_run_args(p):
+    """Arguments common to 'up' and its deprecated 'run' alias."""
+    p.add_argument(
         'config',
         nargs='?',
         help='(deprecated, use --config) Path to config directory'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--config', '-c',
         dest='config_dir',
         help='Path to config directory (default: ./config)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--settings', '-s',
         default='settings.yaml',
         help='Settings file name (default: settings.yaml)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--summary',
         action='store_true',
         help='Print summary only, do not generate HTML'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--output', '-o',
         help='Override output file path'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--quiet', '-q',
         action='store_true',
         help='Minimal output'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--format', '-f',
         choices=['html', 'json', 'csv', 'markdown', 'summary'],
         default='html',
         help='Output format: html (default), json (with reasoning), csv (transactions), markdown, summary (text)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '-v', '--verbose',
         action='count',
         default=0,
         help='Increase output verbosity (use -v for trace, -vv for full details)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--only',
         help='Filter to specific views (comma-separated view names from views.rules)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--category',
         help='Filter to specific category'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--tags',
         help='Filter by tags (comma-separated, e.g., --tags business,reimbursable)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--no-embedded-html',
         dest='embedded_html',
         action='store_false',
         default=True,
         help='Output CSS/JS as separate files instead of embedding (easier to iterate on styling)'
     )
-    up_parser.add_argument(
+    p.add_argument(
         '--migrate',
         action='store_true',
         help='Migrate merchant_categories.csv to new .rules format (non-interactive)'
     )
+
+
+def _add_up_parser(subparsers):
+    up_parser = subparsers.add_parser(
+        'up',
+        help='Parse transactions, categorize them, and generate HTML spending report'
+    )
+    _add_shared_run_args(up_parser)
     up_parser.add_argument(
         '--group-by',
         choices=['merchant', 'subcategory'],
@@ -122,74 +112,14 @@ def main():
         help='Show detailed diff against previous report'
     )
 
+
+def _add_run_parser(subparsers):
     # run subcommand (deprecated alias for 'up' - hidden from help)
     run_parser = subparsers.add_parser('run')
-    run_parser.add_argument(
-        'config',
-        nargs='?',
-        help='(deprecated, use --config) Path to config directory'
-    )
-    run_parser.add_argument(
-        '--config', '-c',
-        dest='config_dir',
-        help='Path to config directory (default: ./config)'
-    )
-    run_parser.add_argument(
-        '--settings', '-s',
-        default='settings.yaml',
-        help='Settings file name (default: settings.yaml)'
-    )
-    run_parser.add_argument(
-        '--summary',
-        action='store_true',
-        help='Print summary only, do not generate HTML'
-    )
-    run_parser.add_argument(
-        '--output', '-o',
-        help='Override output file path'
-    )
-    run_parser.add_argument(
-        '--quiet', '-q',
-        action='store_true',
-        help='Minimal output'
-    )
-    run_parser.add_argument(
-        '--format', '-f',
-        choices=['html', 'json', 'csv', 'markdown', 'summary'],
-        default='html',
-        help='Output format: html (default), json (with reasoning), csv (transactions), markdown, summary (text)'
-    )
-    run_parser.add_argument(
-        '-v', '--verbose',
-        action='count',
-        default=0,
-        help='Increase output verbosity (use -v for trace, -vv for full details)'
-    )
-    run_parser.add_argument(
-        '--only',
-        help='Filter to specific views (comma-separated view names from views.rules)'
-    )
-    run_parser.add_argument(
-        '--category',
-        help='Filter to specific category'
-    )
-    run_parser.add_argument(
-        '--tags',
-        help='Filter by tags (comma-separated, e.g., --tags business,reimbursable)'
-    )
-    run_parser.add_argument(
-        '--no-embedded-html',
-        dest='embedded_html',
-        action='store_false',
-        default=True,
-        help='Output CSS/JS as separate files instead of embedding (easier to iterate on styling)'
-    )
-    run_parser.add_argument(
-        '--migrate',
-        action='store_true',
-        help='Migrate merchant_categories.csv to new .rules format (non-interactive)'
-    )
-    # inspect subcommand
+    _add_shared_run_args(run_parser)
+
+
+def _add_inspect_parser(subparsers):
     inspect_parser = subparsers.add_parser(
         'inspect',
         help='Show CSV columns and sample data to help build a format string',
@@ -207,7 +137,8 @@ def main():
         help='Number of sample rows to display (default: 5)'
     )
 
-    # discover subcommand
+
+def _add_discover_parser(subparsers):
     discover_parser = subparsers.add_parser(
         'discover',
         help='List uncategorized transactions with suggested rules (use --format json for LLMs)',
@@ -242,7 +173,8 @@ def main():
         help='Output format: text (human readable), csv (for import), json (for agents)'
     )
 
-    # diag subcommand
+
+def _add_diag_parser(subparsers):
     diag_parser = subparsers.add_parser(
         'diag',
         help='Debug config issues: show loaded rules, data sources, and errors',
@@ -270,7 +202,8 @@ def main():
         help='Output format: text (human readable), json (for agents)'
     )
 
-    # explain subcommand
+
+def _add_explain_parser(subparsers):
     explain_parser = subparsers.add_parser(
         'explain',
         help='Show how merchants are categorized and which rules match',
@@ -327,7 +260,8 @@ def main():
         help='Transaction amount for testing amount-based rules (e.g., --amount 150.00)'
     )
 
-    # workflow subcommand
+
+def _add_workflow_parser(subparsers):
     workflow_parser = subparsers.add_parser(
         'workflow',
         help='Show context-aware workflow instructions for AI agents',
@@ -344,7 +278,8 @@ def main():
         help='Path to config directory (default: ./config)'
     )
 
-    # reference subcommand
+
+def _add_reference_parser(subparsers):
     reference_parser = subparsers.add_parser(
         'reference',
         help='Show complete rule syntax reference for merchants.rules and views.rules',
@@ -357,14 +292,16 @@ def main():
         help='Specific topic to show (default: show all)'
     )
 
-    # version subcommand
+
+def _add_version_parser(subparsers):
     subparsers.add_parser(
         'version',
         help='Show version information',
         description='Display tally version and build information.'
     )
 
-    # update subcommand
+
+def _add_update_parser(subparsers):
     update_parser = subparsers.add_parser(
         'update',
         help='Update tally to the latest version',
@@ -396,14 +333,85 @@ def main():
         help='Install latest development build from main branch'
     )
 
+
+# Subparser builders, in the order commands appear in --help
+_SUBPARSER_BUILDERS = {
+    'init': _add_init_parser,
+    'up': _add_up_parser,
+    'run': _add_run_parser,
+    'inspect': _add_inspect_parser,
+    'discover': _add_discover_parser,
+    'diag': _add_diag_parser,
+    'explain': _add_explain_parser,
+    'workflow': _add_workflow_parser,
+    'reference': _add_reference_parser,
+    'version': _add_version_parser,
+    'update': _add_update_parser,
+}
+
+
+# Maps each command to its handler attribute on the lazy .commands
+# package; 'up' and its deprecated 'run' alias share a handler.
+_COMMAND_HANDLERS = {
+    'init': 'cmd_init',
+    'up': 'cmd_run',
+    'run': 'cmd_run',
+    'inspect': 'cmd_inspect',
+    'discover': 'cmd_discover',
+    'diag': 'cmd_diag',
+    'explain': 'cmd_explain',
+    'workflow': 'cmd_workflow',
+    'reference': 'cmd_reference',
+    'update': 'cmd_update',
+}
+
+
+def _build_parser(only=None):
+    """Build the argument parser.
+
+    When `only` names a known command, just that command's subparser is
+    constructed - the full tree (~50 add_argument calls) is only needed
+    for --help and unknown-command errors.
+    """
+    parser = argparse.ArgumentParser(
+        prog='tally',
+        description='A tool to help agents classify your bank transactions.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''Run 'tally workflow' to see next steps based on your current state.'''
+    )
+
+    subparsers = parser.add_subparsers(dest='command', title='commands', metavar='<command>')
+
+    if only is not None:
+        _SUBPARSER_BUILDERS[only](subparsers)
+    else:
+        for builder in _SUBPARSER_BUILDERS.values():
+            builder(subparsers)
+
+    return parser
+
+
+def main():
+    """Main entry point for tally CLI."""
+    from .colors import setup_windows_encoding
+    setup_windows_encoding()
+
+    # Peek at argv to build only the selected command's subparser.
+    # Anything else (no args, --help, unknown command) gets the full tree
+    # so help listings and error messages stay complete.
+    first_arg = sys.argv[1] if len(sys.argv) > 1 else None
+    only = first_arg if first_arg in _SUBPARSER_BUILDERS else None
+    parser = _build_parser(only=only)
+
     args = parser.parse_args()
 
     # If no command specified, show help
     if args.command is None:
         parser.print_help()
 
-        # Check for updates
-        update_info = check_for_updates()
+        # Check for updates (imported lazily, rate-limited to once per day)
+        from ._version import maybe_check_for_updates
+        update_info = maybe_check_for_updates()
         if update_info and update_info.get('update_available'):
             print()
             if update_info.get('is_prerelease'):
@@ -415,44 +423,20 @@ def main():
 
         sys.exit(0)
 
-    # Dispatch to command handler
-    # Commands are imported from .commands submodules to reduce file size
-    if args.command == 'init':
-        from .commands import cmd_init
-        cmd_init(args)
-    elif args.command == 'up':
-        from .commands import cmd_run
-        cmd_run(args)
-    elif args.command == 'run':
+    # Dispatch to command handler - O(1) dict lookup into the lazily
+    # imported .commands package instead of an elif chain
+    if args.command == 'run':
         # Deprecated alias for 'up'
+        from .colors import C
         print(f"{C.YELLOW}Note:{C.RESET} 'tally run' is deprecated. Use 'tally up' instead.", file=sys.stderr)
-        from .commands import cmd_run
-        cmd_run(args)
-    elif args.command == 'inspect':
-        from .commands import cmd_inspect
-        cmd_inspect(args)
-    elif args.command == 'discover':
-        from .commands import cmd_discover
-        cmd_discover(args)
-    elif args.command == 'diag':
-        from .commands import cmd_diag
-        cmd_diag(args)
-    elif args.command == 'explain':
-        from .commands import cmd_explain
-        cmd_explain(args)
-    elif args.command == 'workflow':
-        from .commands import cmd_workflow
-        cmd_workflow(args)
-    elif args.command == 'reference':
-        from .commands import cmd_reference
-        cmd_reference(args)
     elif args.command == 'version':
+        from ._version import VERSION, GIT_SHA, REPO_URL, maybe_check_for_updates
         sha_display = GIT_SHA[:8] if GIT_SHA != 'unknown' else 'unknown'
         print(f"tally {VERSION} ({sha_display})")
         print(REPO_URL)
 
-        # Check for updates
-        update_info = check_for_updates()
+        # Check for updates (rate-limited; cached result within 24h)
+        update_info = maybe_check_for_updates()
         if update_info and update_info.get('update_available'):
             print()
             if update_info.get('is_prerelease'):
@@ -461,10 +445,11 @@ def main():
             else:
                 print(f"Update available: v{update_info['latest_version']}")
                 print(f"  Run 'tally update' to install")
-    elif args.command == 'update':
-        from .commands import cmd_update
-        cmd_update(args)
+        return
 
+    from . import commands
+    handler = getattr(commands, _COMMAND_HANDLERS[args.command])
+    handler(args)
 
 if __name__ == '__main__':
     main()
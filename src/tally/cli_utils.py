@@ -5,15 +5,22 @@ This module contains shared utilities used by command modules,
 keeping them separate from the main CLI argument parsing.
 """
 
+import functools
 import os
 import sys
 
 from .colors import C
-from .templates import STARTER_SETTINGS, STARTER_MERCHANTS, STARTER_VIEWS
 
 
-# Collect deprecation warnings to print at end (avoids breaking JSON output)
+# Collect deprecation warnings to print at end (avoids breaking JSON output).
+# The list preserves insertion order for printing; the set makes the dedup
+# check O(1) when the same parser fires for every row of a large CSV.
 _deprecated_parser_warnings = []
+_deprecated_parser_warnings_seen = set()
+
+# Escapes backslash and double-quote for regex_replace() examples in one
+# C-level pass (vs. two chained str.replace calls)
+_ESCAPE_TABLE = str.maketrans({'\\': '\\\\', '"': '\\"'})
 
 
 def find_config_dir():
@@ -29,22 +36,41 @@ def find_config_dir():
 
     Returns None if no config directory is found.
     """
-    # Check environment variable first
-    env_config = os.environ.get('TALLY_CONFIG')
+    # Memoized per (cwd, env var) - several command handlers call this and
+    # the filesystem probing only needs to happen once per process. Code
+    # that creates config dirs must call invalidate_config_dir_cache().
+    return _find_config_dir_cached(os.getcwd(), os.environ.get('TALLY_CONFIG'))
+
+
+def invalidate_config_dir_cache():
+    """Drop the memoized find_config_dir result (after creating config dirs)."""
+    _find_config_dir_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _find_config_dir_cached(cwd, env_config):
+    # Check environment variable first (skip normalization when already absolute)
     if env_config:
-        env_path = os.path.abspath(env_config)
+        env_path = env_config if os.path.isabs(env_config) else os.path.abspath(env_config)
         if os.path.isdir(env_path):
             return env_path
 
+    # A single scandir of cwd answers both layout probes (the entry type
+    # comes from the directory listing, no per-path stat).
+    try:
+        cwd_dirs = {e.name for e in os.scandir(cwd) if e.is_dir()}
+    except OSError:
+        cwd_dirs = set()
+
     # Check old layout (backwards compatibility)
-    old_layout = os.path.abspath('config')
-    if os.path.isdir(old_layout):
-        return old_layout
+    if 'config' in cwd_dirs:
+        return os.path.join(cwd, 'config')
 
     # Check new layout
-    new_layout = os.path.abspath(os.path.join('tally', 'config'))
-    if os.path.isdir(new_layout):
-        return new_layout
+    if 'tally' in cwd_dirs:
+        new_layout = os.path.join(cwd, 'tally', 'config')
+        if os.path.isdir(new_layout):
+            return new_layout
 
     return None
 
@@ -88,57 +114,60 @@ def resolve_config_dir(args, required=True):
 
 def init_config(target_dir):
     """Initialize a new config directory with starter files."""
-    import datetime
+    import time
+
+    # ~5 KB of starter text only 'init' needs - loaded on demand
+    from .templates import STARTER_SETTINGS, STARTER_MERCHANTS, STARTER_VIEWS
 
     config_dir = os.path.join(target_dir, 'config')
-    data_dir = os.path.join(target_dir, 'data')
-    output_dir = os.path.join(target_dir, 'output')
 
-    # Create directories
+    # Create directories (config/ first so target_dir comes along for free)
     os.makedirs(config_dir, exist_ok=True)
-    os.makedirs(data_dir, exist_ok=True)
-    os.makedirs(output_dir, exist_ok=True)
+    for subdir in ('data', 'output'):
+        os.makedirs(os.path.join(target_dir, subdir), exist_ok=True)
 
-    current_year = datetime.datetime.now().year
+    # time is a C module and already loaded; datetime would import just for this
+    current_year = time.localtime().tm_year
     files_created = []
     files_skipped = []
 
+    def write_if_missing(path, label, content):
+        # open('x') is a single O_CREAT|O_EXCL open - no exists() stat
+        # first, and no up-front scandir of config_dir needed either
+        try:
+            with open(path, 'x', encoding='utf-8') as f:
+                f.write(content)
+            files_created.append(label)
+        except FileExistsError:
+            files_skipped.append(label)
+
     # Write settings.yaml
-    settings_path = os.path.join(config_dir, 'settings.yaml')
-    if not os.path.exists(settings_path):
-        with open(settings_path, 'w', encoding='utf-8') as f:
-            f.write(STARTER_SETTINGS.format(year=current_year))
-        files_created.append('config/settings.yaml')
-    else:
-        files_skipped.append('config/settings.yaml')
+    write_if_missing(os.path.join(config_dir, 'settings.yaml'),
+                     'config/settings.yaml',
+                     STARTER_SETTINGS.format(year=current_year))
 
     # Write merchants.rules (new expression-based format)
-    merchants_path = os.path.join(config_dir, 'merchants.rules')
-    if not os.path.exists(merchants_path):
-        with open(merchants_path, 'w', encoding='utf-8') as f:
-            f.write(STARTER_MERCHANTS)
-        files_created.append('config/merchants.rules')
-    else:
-        files_skipped.append('config/merchants.rules')
+    write_if_missing(os.path.join(config_dir, 'merchants.rules'),
+                     'config/merchants.rules', STARTER_MERCHANTS)
 
     # Write views.rules
-    sections_path = os.path.join(config_dir, 'views.rules')
-    if not os.path.exists(sections_path):
-        with open(sections_path, 'w', encoding='utf-8') as f:
-            f.write(STARTER_VIEWS)
-        files_created.append('config/views.rules')
-    else:
-        files_skipped.append('config/views.rules')
+    write_if_missing(os.path.join(config_dir, 'views.rules'),
+                     'config/views.rules', STARTER_VIEWS)
 
     # Create .gitignore for data privacy
     gitignore_path = os.path.join(target_dir, '.gitignore')
-    if not os.path.exists(gitignore_path):
-        with open(gitignore_path, 'w', encoding='utf-8') as f:
+    try:
+        with open(gitignore_path, 'x', encoding='utf-8') as f:
             f.write('''# Tally - Ignore sensitive data
 data/
 output/
 ''')
         files_created.append('.gitignore')
+    except FileExistsError:
+        pass
+
+    # New directories may change what find_config_dir resolves
+    invalidate_config_dir_cache()
 
     return files_created, files_skipped
 
@@ -146,7 +175,8 @@ output/
 def warn_deprecated_parser(source_name, parser_type, filepath):
     """Record deprecation warning for amex/boa parsers (to print at end)."""
     warning = (source_name, parser_type, filepath)
-    if warning not in _deprecated_parser_warnings:
+    if warning not in _deprecated_parser_warnings_seen:
+        _deprecated_parser_warnings_seen.add(warning)
         _deprecated_parser_warnings.append(warning)
 
 
@@ -154,49 +184,67 @@ def print_deprecation_warnings(config=None):
     """Print all collected deprecation warnings to stderr (to avoid breaking JSON output)."""
     has_warnings = False
 
-    # Print config-based warnings (more detailed, from config_loader)
+    # Buffer all lines and emit with one write - avoids a syscall plus
+    # stderr lock acquisition per line, and keeps the block atomic.
+    # Color prefixes/suffixes are built once here instead of re-assembled
+    # by an f-string on every loop iteration.
+    lines = []
+    warn_prefix = C.YELLOW + '⚠ '
+    green = C.GREEN
+    reset = C.RESET
+
+    # Config-based warnings (more detailed, from config_loader)
     if config and config.get('_warnings'):
         has_warnings = True
-        print(file=sys.stderr)
-        print(f"{C.YELLOW}{'=' * 70}{C.RESET}", file=sys.stderr)
-        print(f"{C.YELLOW}DEPRECATION WARNINGS{C.RESET}", file=sys.stderr)
-        print(f"{C.YELLOW}{'=' * 70}{C.RESET}", file=sys.stderr)
+        rule = C.YELLOW + '=' * 70 + reset
+        lines.append('')
+        lines.append(rule)
+        lines.append(C.YELLOW + 'DEPRECATION WARNINGS' + reset)
+        lines.append(rule)
         for warning in config['_warnings']:
-            print(file=sys.stderr)
-            print(f"{C.YELLOW}⚠ {warning['message']}{C.RESET}", file=sys.stderr)
-            print(f"  {warning['suggestion']}", file=sys.stderr)
+            lines.append('')
+            lines.append(warn_prefix + warning['message'] + reset)
+            lines.append('  ' + warning['suggestion'])
             if 'example' in warning:
-                print(file=sys.stderr)
-                print(f"  {C.DIM}Suggested config:{C.RESET}", file=sys.stderr)
+                lines.append('')
+                lines.append(f"  {C.DIM}Suggested config:{reset}")
                 for line in warning['example'].split('\n'):
-                    print(f"  {C.GREEN}{line}{C.RESET}", file=sys.stderr)
-        print(file=sys.stderr)
+                    lines.append('  ' + green + line + reset)
+        lines.append('')
 
-    # Print legacy parser warnings (if not already covered by config warnings)
+    # Legacy parser warnings (if not already covered by config warnings)
     if _deprecated_parser_warnings and not has_warnings:
-        print(file=sys.stderr)
+        warning_label = C.YELLOW + 'Warning:' + reset
+        lines.append('')
         for source_name, parser_type, filepath in _deprecated_parser_warnings:
-            print(f"{C.YELLOW}Warning:{C.RESET} The '{parser_type}' parser is deprecated and will be removed in a future release.", file=sys.stderr)
-            print(f"  Source: {source_name}", file=sys.stderr)
-            print(f"  Run: {C.GREEN}tally inspect {filepath}{C.RESET} to get a format string for your CSV.", file=sys.stderr)
-            print(f"  Then update settings.yaml to use 'format:' instead of 'type: {parser_type}'", file=sys.stderr)
-            print(file=sys.stderr)
+            lines.append(f"{warning_label} The '{parser_type}' parser is deprecated and will be removed in a future release.")
+            lines.append(f"  Source: {source_name}")
+            lines.append(f"  Run: {green}tally inspect {filepath}{reset} to get a format string for your CSV.")
+            lines.append(f"  Then update settings.yaml to use 'format:' instead of 'type: {parser_type}'")
+            lines.append('')
 
     _deprecated_parser_warnings.clear()
+    _deprecated_parser_warnings_seen.clear()
+
+    if lines:
+        sys.stderr.write('\n'.join(lines) + '\n')
 
 
 def check_deprecated_description_cleaning(config):
     """Check for deprecated description_cleaning setting and fail with migration instructions."""
     if config.get('description_cleaning'):
         patterns = config['description_cleaning']
-        print("Error: 'description_cleaning' setting has been removed.", file=sys.stderr)
-        print("\nMigrate to field transforms in merchants.rules:", file=sys.stderr)
-        print("", file=sys.stderr)
+        lines = [
+            "Error: 'description_cleaning' setting has been removed.",
+            "\nMigrate to field transforms in merchants.rules:",
+            "",
+        ]
         for pattern in patterns[:3]:  # Show first 3 examples
             # Escape the pattern for the regex_replace function
-            escaped = pattern.replace('\\', '\\\\').replace('"', '\\"')
-            print(f'  field.description = regex_replace(field.description, "{escaped}", "")', file=sys.stderr)
+            escaped = pattern.translate(_ESCAPE_TABLE)
+            lines.append(f'  field.description = regex_replace(field.description, "{escaped}", "")')
         if len(patterns) > 3:
-            print(f"  # ... and {len(patterns) - 3} more patterns", file=sys.stderr)
-        print("\nAdd these lines at the top of your merchants.rules file.", file=sys.stderr)
+            lines.append(f"  # ... and {len(patterns) - 3} more patterns")
+        lines.append("\nAdd these lines at the top of your merchants.rules file.")
+        sys.stderr.write('\n'.join(lines) + '\n')
         sys.exit(1)
@@ -2,13 +2,18 @@
 Terminal color utilities for tally CLI.
 """
 
+import functools
 import os
 import sys
+from types import SimpleNamespace
 
 
+@functools.lru_cache(maxsize=1)
 def supports_color():
-    """Check if the terminal supports color output."""
-    if not sys.stdout.isatty():
+    """Check if the terminal supports color output (memoized)."""
+    # isatty may be missing on wrapped/replaced streams (e.g. PyInstaller)
+    isatty = getattr(sys.stdout, 'isatty', None)
+    if not (isatty and isatty()):
         return False
     if os.environ.get('NO_COLOR'):
         return False
@@ -19,9 +24,18 @@ def supports_color():
     return term != 'dumb'
 
 
+# Tri-state memo: None = not attempted, False = not applicable (non-Windows),
+# True = streams reconfigured. Repeated CLI entries skip the work entirely.
+_encoding_setup_done = None
+
+
 def setup_windows_encoding():
     """Set UTF-8 encoding on Windows to support Unicode output."""
+    global _encoding_setup_done
+    if _encoding_setup_done is not None:
+        return
     if sys.platform != 'win32':
+        _encoding_setup_done = False
         return
 
     import codecs
@@ -44,35 +58,51 @@ def setup_windows_encoding():
             except Exception:
                 pass
 
+    _encoding_setup_done = True
+
+
+# Precomputed ANSI palettes - chosen once instead of branching per field
+# in a class __init__
+_COLORS_ON = SimpleNamespace(
+    RESET='\033[0m',
+    BOLD='\033[1m',
+    DIM='\033[2m',
+    GREEN='\033[32m',
+    CYAN='\033[36m',
+    BLUE='\033[34m',
+    YELLOW='\033[33m',
+    RED='\033[31m',
+    UNDERLINE='\033[4m',
+)
+
+# Empty strings keep piped/redirected output free of escape bytes -
+# downstream consumers never need to strip ANSI codes
+_COLORS_OFF = SimpleNamespace(
+    RESET='',
+    BOLD='',
+    DIM='',
+    GREEN='',
+    CYAN='',
+    BLUE='',
+    YELLOW='',
+    RED='',
+    UNDERLINE='',
+)
+
+class _LazyColors:
+    """Proxy that defers the color check until a color is first used.
+
+    Paths that never touch C (--help, argparse errors) skip the tty and
+    env probing entirely. Resolved values are cached on the instance, so
+    later lookups are plain attribute access.
+    """
 
-# Run Windows encoding setup on import
-setup_windows_encoding()
-
-
-class Colors:
-    """ANSI color codes with automatic detection."""
-    def __init__(self):
-        if supports_color():
-            self.RESET = '\033[0m'
-            self.BOLD = '\033[1m'
-            self.DIM = '\033[2m'
-            self.GREEN = '\033[32m'
-            self.CYAN = '\033[36m'
-            self.BLUE = '\033[34m'
-            self.YELLOW = '\033[33m'
-            self.RED = '\033[31m'
-            self.UNDERLINE = '\033[4m'
-        else:
-            self.RESET = ''
-            self.BOLD = ''
-            self.DIM = ''
-            self.GREEN = ''
-            self.CYAN = ''
-            self.BLUE = ''
-            self.YELLOW = ''
-            self.RED = ''
-            self.UNDERLINE = ''
+    def __getattr__(self, name):
+        palette = _COLORS_ON if supports_color() else _COLORS_OFF
+        value = getattr(palette, name)
+        setattr(self, name, value)
+        return value
 
 
 # Singleton instance
-C = Colors()
+C = _LazyColors()
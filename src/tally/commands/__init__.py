@@ -1,27 +1,30 @@
 """
 Tally CLI commands.
 
-Each command is in its own module for easier maintenance.
+Each command is in its own module for easier maintenance. Modules are
+imported lazily (PEP 562) so dispatching one command doesn't pay the
+import cost of all the others.
 """
 
-from .run import cmd_run
-from .workflow import cmd_workflow
-from .update import cmd_update
-from .reference import cmd_reference
-from .diag import cmd_diag
-from .discover import cmd_discover
-from .inspect import cmd_inspect
-from .init import cmd_init
-from .explain import cmd_explain
+# Maps each exported command to the submodule that defines it
+_COMMAND_MODULES = {
+    'cmd_run': 'run',
+    'cmd_workflow': 'workflow',
+    'cmd_update': 'update',
+    'cmd_reference': 'reference',
+    'cmd_diag': 'diag',
+    'cmd_discover': 'discover',
+    'cmd_inspect': 'inspect',
+    'cmd_init': 'init',
+    'cmd_explain': 'explain',
+}
 
-__all__ = [
-    'cmd_run',
-    'cmd_workflow',
-    'cmd_update',
-    'cmd_reference',
-    'cmd_diag',
-    'cmd_discover',
-    'cmd_inspect',
-    'cmd_init',
-    'cmd_explain',
-]
+__all__ = list(_COMMAND_MODULES)
+
+
+def __getattr__(name):
+    module_name = _COMMAND_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(f'.{module_name}', __name__), name)
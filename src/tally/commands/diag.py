@@ -2,7 +2,9 @@
 Tally 'diag' command - Show diagnostic information about config and rules.
 """
 
+import functools
 import os
+import re
 import sys
 
 from collections import Counter
@@ -11,133 +13,273 @@ from ..colors import C
 from ..cli_utils import resolve_config_dir
 from ..classification import SPECIAL_TAGS
 from ..config_loader import load_config
-from ..merchant_utils import get_all_rules, diagnose_rules, get_transforms
-from ..parsers import parse_generic_csv, ParseResult, SkippedRow
+from ..merchant_utils import diagnose_rules, get_transforms
+from ..parsers import parse_generic_csv
 from ..path_utils import resolve_data_source_paths
 
+# Cross-source query detection (list comprehensions referencing data
+# sources) - compiled once instead of per rule
+_CROSS_SOURCE_RE = re.compile(
+    r'\[.*\bfor\b.*\bin\b.*\]|\b(?:any|sum|len|next)\s*\(.*\bfor\b.*\bin\b')
+
+
+@functools.lru_cache(maxsize=256)
+def _path_exists(path):
+    """Memoized existence probe - diag checks several paths more than once.
+
+    os.access(F_OK) answers the boolean without populating a stat buffer
+    nobody reads. cmd_diag clears the cache on entry so repeated
+    invocations in one process (tests) observe filesystem changes.
+    """
+    return os.access(path, os.F_OK)
+
+
+def _count_csv_rows(filepath):
+    """Data rows in a CSV file, counted as newlines over the raw bytes.
+
+    bytes.count is a vectorized C scan - much cheaper than csv-parsing
+    every field just to discard it. Counts physical lines, so a quoted
+    field containing a newline counts twice - fine for a diagnostic
+    readout.
+    """
+    lines = 0
+    chunk = b''
+    with open(filepath, 'rb') as f:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            chunk = block
+            lines += chunk.count(b'\n')
+    if chunk and not chunk.endswith(b'\n'):
+        lines += 1  # unterminated final line
+    return max(lines - 1, 0)  # minus header
+
+
+def _dir_entries(path):
+    """DirEntry objects by name from one scandir (empty dict if absent).
+
+    One getdents pass replaces the per-file stat that os.path.exists
+    would issue for every membership check against the same directory,
+    and the entries carry stat info (size) without another syscall.
+    """
+    try:
+        return {e.name: e for e in os.scandir(path)}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def _emit_diag_json(args, config_dir, config_dir_exists, settings_path,
+                    settings_exists, budget_dir):
+    """Emit diagnostics as JSON only - none of the text report is built."""
+    import json as json_module
+
+    config = None
+    if config_dir_exists and settings_exists:
+        try:
+            config = load_config(config_dir, args.settings)
+        except Exception:
+            config = None  # settings errors surface in the text report
+
+    merchants_file = config.get('_merchants_file') if config else None
+    if merchants_file:
+        diag = diagnose_rules(merchants_file)
+    else:
+        diag = {'user_rules_path': None, 'user_rules_exists': False,
+                'user_rules_count': 0, 'user_rules': [],
+                'user_rules_errors': [], 'total_rules': 0}
+    output = {
+        'config_dir': config_dir,
+        'config_dir_exists': config_dir_exists,
+        'settings_file': settings_path,
+        'settings_exists': settings_exists,
+        'data_sources': [],
+        'rules': {
+            'user_rules_path': diag['user_rules_path'],
+            'user_rules_exists': diag['user_rules_exists'],
+            'user_rules_count': diag['user_rules_count'],
+            'user_rules': [
+                {'pattern': r[0], 'merchant': r[1], 'category': r[2], 'subcategory': r[3], 'tags': r[4] if len(r) > 4 else []}
+                for r in diag['user_rules']
+            ],
+            'errors': diag['user_rules_errors'],
+            'total_rules': diag['total_rules'],
+            'rules_with_tags': diag.get('rules_with_tags', 0),
+            'unique_tags': sorted(diag.get('unique_tags', set())),
+        }
+    }
+    if config and config.get('data_sources'):
+        # One scandir per distinct directory answers all leaf checks;
+        # an absent directory rules out its whole group with no
+        # per-file stats
+        entries_by_dir = {}
+        for source in config['data_sources']:
+            rel_dir = os.path.dirname(source['file'])
+            if rel_dir not in entries_by_dir:
+                entries_by_dir[rel_dir] = _dir_entries(os.path.join(budget_dir, rel_dir))
+            output['data_sources'].append({
+                'name': source.get('name'),
+                'file': source['file'],
+                'exists': os.path.basename(source['file']) in entries_by_dir[rel_dir],
+                'type': source.get('type'),
+                'format': source.get('format'),
+            })
+    # Stream the encoding instead of materializing the full dumps()
+    # string next to the dict (one traversal, half the peak memory)
+    write = sys.stdout.write
+    for piece in json_module.JSONEncoder(indent=2).iterencode(output):
+        write(piece)
+    write('\n')
+
 
 def cmd_diag(args):
     """Handle the 'diag' subcommand - show diagnostic information about config and rules."""
-    import json as json_module
+    _path_exists.cache_clear()
+
+    # Buffer the whole report and emit it with a single write at the end
+    # (one syscall instead of one per line)
+    out = []
+    emit = out.append
 
     # Determine config directory (don't require it - diag shows status even if missing)
     config_dir = resolve_config_dir(args, required=False)
     if config_dir is None:
         config_dir = os.path.abspath('config')  # Default for display purposes
 
-    print("BUDGET ANALYZER DIAGNOSTICS")
-    print("=" * 70)
-    print()
+    config_entries = _dir_entries(config_dir)
+    config_dir_exists = bool(config_entries) or os.path.isdir(config_dir)
+    settings_path = os.path.join(config_dir, args.settings)
+    budget_dir = os.path.dirname(config_dir)
+    if os.sep in args.settings:
+        settings_exists = _path_exists(settings_path)  # nested path - not in the listing
+    else:
+        settings_exists = args.settings in config_entries
+
+    # Machine callers get pure JSON and skip the whole text render
+    # (string building, row counting, rules/views formatting)
+    if args.format == 'json':
+        _emit_diag_json(args, config_dir, config_dir_exists, settings_path,
+                        settings_exists, budget_dir)
+        return
+
+    emit("BUDGET ANALYZER DIAGNOSTICS")
+    emit("=" * 70)
+    emit('')
 
     # Config directory info
-    print("CONFIGURATION")
-    print("-" * 70)
-    print(f"Config directory: {config_dir}")
-    print(f"  Exists: {os.path.isdir(config_dir)}")
-    print()
-
-    if not os.path.isdir(config_dir):
-        print("ERROR: Config directory not found!")
-        print("Run 'tally init' to create a new budget directory.")
+    emit("CONFIGURATION")
+    emit("-" * 70)
+    emit(f"Config directory: {config_dir}")
+    emit(f"  Exists: {config_dir_exists}")
+    emit('')
+
+    if not config_dir_exists:
+        emit("ERROR: Config directory not found!")
+        emit("Run 'tally init' to create a new budget directory.")
+        sys.stdout.write('\n'.join(out) + '\n')
         sys.exit(1)
 
     # Settings file
-    settings_path = os.path.join(config_dir, args.settings)
-    budget_dir = os.path.dirname(config_dir)
-    print(f"Settings file: {settings_path}")
-    print(f"  Exists: {os.path.exists(settings_path)}")
+    emit(f"Settings file: {settings_path}")
+    emit(f"  Exists: {settings_exists}")
 
     config = None
     config_issues = []
+    transforms = []  # parsed once here, reused by PARSING HEALTH below
 
-    if os.path.exists(settings_path):
+    if settings_exists:
         try:
             config = load_config(config_dir, args.settings)
-            print(f"  Loaded successfully: Yes")
-            print(f"  Year: {config.get('year', 'not set')}")
-            print(f"  Output dir: {config.get('output_dir', 'not set')}")
+            emit(f"  Loaded successfully: Yes")
+            emit(f"  Year: {config.get('year', 'not set')}")
+            emit(f"  Output dir: {config.get('output_dir', 'not set')}")
             currency_fmt = config.get('currency_format', '${amount}')
             from ..analyzer import format_currency
-            print(f"  Currency format: {currency_fmt}")
-            print(f"    Example: {format_currency(1234, currency_fmt)}")
+            emit(f"  Currency format: {currency_fmt}")
+            emit(f"    Example: {format_currency(1234, currency_fmt)}")
             rule_mode = config.get('rule_mode', 'first_match')
-            print(f"  Rule mode: {rule_mode}")
+            emit(f"  Rule mode: {rule_mode}")
             # Show field transforms from merchants.rules
             transforms = get_transforms(config.get('_merchants_file'), match_mode=rule_mode)
             if transforms:
-                print(f"  Field transforms: {len(transforms)} transform(s)")
+                emit(f"  Field transforms: {len(transforms)} transform(s)")
                 for field_path, expr in transforms[:5]:
-                    print(f"    - {field_path} = {expr}")
+                    emit(f"    - {field_path} = {expr}")
                 if len(transforms) > 5:
-                    print(f"    ... and {len(transforms) - 5} more")
+                    emit(f"    ... and {len(transforms) - 5} more")
             else:
-                print(f"  Field transforms: none configured")
+                emit(f"  Field transforms: none configured")
         except Exception as e:
-            print(f"  Loaded successfully: No")
-            print(f"  Error: {e}")
+            emit(f"  Loaded successfully: No")
+            emit(f"  Error: {e}")
             config_issues.append(f"settings.yaml error: {e}")
     else:
         config_issues.append("settings.yaml not found")
-    print()
+    emit('')
+
+    # Bind the repeatedly-consulted keys once - every section below reads
+    # from these locals instead of re-hashing into the config dict
+    merchants_file = config.get('_merchants_file') if config else None
+    merchants_format = config.get('_merchants_format') if config else None
+    merchants_file_setting = config.get('merchants_file') if config else None
+    views_file_setting = config.get('views_file') if config else None
+    data_sources = (config.get('data_sources') or []) if config else []
 
     # CONFIG HEALTH CHECK - identify common issues
-    print("CONFIG HEALTH CHECK")
-    print("-" * 70)
+    emit("CONFIG HEALTH CHECK")
+    emit("-" * 70)
 
     # Check for legacy CSV file
     legacy_csv = os.path.join(config_dir, 'merchant_categories.csv')
-    merchants_rules = os.path.join(config_dir, 'merchants.rules')
-    views_rules = os.path.join(config_dir, 'views.rules')
+    has_legacy_csv = 'merchant_categories.csv' in config_entries
+    has_merchants_rules = 'merchants.rules' in config_entries
+    has_views_rules = 'views.rules' in config_entries
 
-    if os.path.exists(legacy_csv) and not os.path.exists(merchants_rules):
+    if has_legacy_csv and not has_merchants_rules:
         config_issues.append(f"Legacy CSV format detected: {os.path.basename(legacy_csv)}")
-        print(f"  {C.YELLOW}⚠{C.RESET}  Legacy merchant_categories.csv found")
-        print(f"       Run 'tally up --migrate' to upgrade to .rules format")
+        emit(f"  {C.YELLOW}⚠{C.RESET}  Legacy merchant_categories.csv found")
+        emit(f"       Run 'tally up --migrate' to upgrade to .rules format")
 
     # Check if merchants_file is set in settings
     if config:
-        merchants_file_setting = config.get('merchants_file')
-        views_file_setting = config.get('views_file')
-
         # Check merchants_file reference
         if not merchants_file_setting:
-            if os.path.exists(merchants_rules):
+            if has_merchants_rules:
                 config_issues.append("merchants.rules exists but not configured in settings.yaml")
-                print(f"  {C.YELLOW}⚠{C.RESET}  config/merchants.rules exists but not in settings.yaml")
-                print(f"       Add: merchants_file: config/merchants.rules")
-            elif not os.path.exists(legacy_csv):
-                print(f"  {C.YELLOW}⚠{C.RESET}  No merchant rules configured")
-                print(f"       All transactions will be categorized as 'Unknown'")
+                emit(f"  {C.YELLOW}⚠{C.RESET}  config/merchants.rules exists but not in settings.yaml")
+                emit(f"       Add: merchants_file: config/merchants.rules")
+            elif not has_legacy_csv:
+                emit(f"  {C.YELLOW}⚠{C.RESET}  No merchant rules configured")
+                emit(f"       All transactions will be categorized as 'Unknown'")
         else:
             resolved_path = os.path.join(budget_dir, merchants_file_setting)
-            if not os.path.exists(resolved_path):
+            if not _path_exists(resolved_path):
                 config_issues.append(f"merchants_file points to missing file: {merchants_file_setting}")
-                print(f"  {C.RED}✗{C.RESET}  merchants_file: {merchants_file_setting}")
-                print(f"       File not found at: {resolved_path}")
+                emit(f"  {C.RED}✗{C.RESET}  merchants_file: {merchants_file_setting}")
+                emit(f"       File not found at: {resolved_path}")
             else:
-                print(f"  {C.GREEN}✓{C.RESET}  merchants_file: {merchants_file_setting}")
+                emit(f"  {C.GREEN}✓{C.RESET}  merchants_file: {merchants_file_setting}")
 
         # Check views_file reference
         if not views_file_setting:
-            if os.path.exists(views_rules):
+            if has_views_rules:
                 config_issues.append("views.rules exists but not configured in settings.yaml")
-                print(f"  {C.YELLOW}⚠{C.RESET}  config/views.rules exists but not in settings.yaml")
-                print(f"       Add: views_file: config/views.rules")
+                emit(f"  {C.YELLOW}⚠{C.RESET}  config/views.rules exists but not in settings.yaml")
+                emit(f"       Add: views_file: config/views.rules")
         else:
             resolved_path = os.path.join(budget_dir, views_file_setting)
-            if not os.path.exists(resolved_path):
+            if not _path_exists(resolved_path):
                 config_issues.append(f"views_file points to missing file: {views_file_setting}")
-                print(f"  {C.RED}✗{C.RESET}  views_file: {views_file_setting}")
-                print(f"       File not found at: {resolved_path}")
+                emit(f"  {C.RED}✗{C.RESET}  views_file: {views_file_setting}")
+                emit(f"       File not found at: {resolved_path}")
             else:
-                print(f"  {C.GREEN}✓{C.RESET}  views_file: {views_file_setting}")
+                emit(f"  {C.GREEN}✓{C.RESET}  views_file: {views_file_setting}")
 
         # Check data sources
-        data_sources = config.get('data_sources', [])
         if not data_sources:
             config_issues.append("No data sources configured")
-            print(f"  {C.YELLOW}⚠{C.RESET}  No data sources configured")
-            print(f"       Add data_sources to settings.yaml to process transactions")
+            emit(f"  {C.YELLOW}⚠{C.RESET}  No data sources configured")
+            emit(f"       Add data_sources to settings.yaml to process transactions")
         else:
             missing_sources = []
             for source in data_sources:
@@ -148,42 +290,42 @@ def cmd_diag(args):
                 missing_names = ', '.join(f for f, _ in missing_sources)
                 config_issues.append(f"Missing data files: {missing_names}")
                 for f, kind in missing_sources:
-                    print(f"  {C.RED}✗{C.RESET}  data source: {f}")
+                    emit(f"  {C.RED}✗{C.RESET}  data source: {f}")
                     if kind == 'glob':
-                        print(f"       No files matched")
+                        emit(f"       No files matched")
                     elif kind == 'dir':
-                        print(f"       No CSV files found")
+                        emit(f"       No CSV files found")
                     else:
-                        print(f"       File not found")
+                        emit(f"       File not found")
             else:
-                print(f"  {C.GREEN}✓{C.RESET}  data_sources: {len(data_sources)} configured, all files exist")
+                emit(f"  {C.GREEN}✓{C.RESET}  data_sources: {len(data_sources)} configured, all files exist")
 
     if not config_issues:
-        print(f"  {C.GREEN}✓{C.RESET}  All configuration files are valid")
+        emit(f"  {C.GREEN}✓{C.RESET}  All configuration files are valid")
 
-    print()
+    emit('')
 
     # FILE PATHS - show how paths are resolved
-    print("FILE PATHS")
-    print("-" * 70)
-    print(f"  Budget directory:  {budget_dir}")
-    print(f"  Config directory:  {config_dir}")
-    print()
-    print("  Path resolution (relative paths in settings.yaml are resolved from budget dir):")
+    emit("FILE PATHS")
+    emit("-" * 70)
+    emit(f"  Budget directory:  {budget_dir}")
+    emit(f"  Config directory:  {config_dir}")
+    emit('')
+    emit("  Path resolution (relative paths in settings.yaml are resolved from budget dir):")
     if config:
-        if config.get('merchants_file'):
-            mf = config['merchants_file']
+        if merchants_file_setting:
+            mf = merchants_file_setting
             resolved = os.path.join(budget_dir, mf)
-            exists = "exists" if os.path.exists(resolved) else "NOT FOUND"
-            print(f"    merchants_file: {mf}")
-            print(f"      → {resolved} ({exists})")
-        if config.get('views_file'):
-            vf = config['views_file']
+            exists = "exists" if _path_exists(resolved) else "NOT FOUND"
+            emit(f"    merchants_file: {mf}")
+            emit(f"      → {resolved} ({exists})")
+        if views_file_setting:
+            vf = views_file_setting
             resolved = os.path.join(budget_dir, vf)
-            exists = "exists" if os.path.exists(resolved) else "NOT FOUND"
-            print(f"    views_file: {vf}")
-            print(f"      → {resolved} ({exists})")
-        for source in config.get('data_sources', []):
+            exists = "exists" if _path_exists(resolved) else "NOT FOUND"
+            emit(f"    views_file: {vf}")
+            emit(f"      → {resolved} ({exists})")
+        for source in data_sources:
             sf = source['file']
             resolved_files, kind = resolve_data_source_paths(config_dir, sf)
             if resolved_files:
@@ -192,86 +334,68 @@ def cmd_diag(args):
             else:
                 resolved = os.path.join(budget_dir, sf)
                 exists = "NOT FOUND" if kind == 'missing' else "NO MATCHES"
-            print(f"    data_source: {sf}")
-            print(f"      → {resolved} ({exists})")
-    print()
+            emit(f"    data_source: {sf}")
+            emit(f"      → {resolved} ({exists})")
+    emit('')
 
     # Data sources
-    if config and config.get('data_sources'):
-        print("DATA SOURCES")
-        print("-" * 70)
+    if data_sources:
+        emit("DATA SOURCES")
+        emit("-" * 70)
 
         # Count primary vs supplemental
-        primary_sources = [s for s in config['data_sources'] if not s.get('supplemental')]
-        supplemental_sources = [s for s in config['data_sources'] if s.get('supplemental')]
+        primary_sources = [s for s in data_sources if not s.get('supplemental')]
+        supplemental_sources = [s for s in data_sources if s.get('supplemental')]
 
         if supplemental_sources:
-            print(f"  {C.BOLD}Primary sources:{C.RESET} {len(primary_sources)}  {C.BOLD}Supplemental sources:{C.RESET} {len(supplemental_sources)}")
-            print()
+            emit(f"  {C.BOLD}Primary sources:{C.RESET} {len(primary_sources)}  {C.BOLD}Supplemental sources:{C.RESET} {len(supplemental_sources)}")
+            emit('')
 
-        for i, source in enumerate(config['data_sources'], 1):
+        for i, source in enumerate(data_sources, 1):
             files, _ = resolve_data_source_paths(config_dir, source.get('file'))
 
             # Show supplemental badge
             is_supplemental = source.get('supplemental', False)
             badge = f" {C.CYAN}[supplemental]{C.RESET}" if is_supplemental else ""
-            print(f"  {i}. {source.get('name', 'unnamed')}{badge}")
-            print(f"     File: {source['file']}")
+            emit(f"  {i}. {source.get('name', 'unnamed')}{badge}")
+            emit(f"     File: {source['file']}")
 
             # Show file exists + row count
             if files:
                 try:
-                    import csv
-                    row_count = 0
-                    for filepath in files:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            reader = csv.reader(f)
-                            next(reader, None)  # Skip header
-                            row_count += sum(1 for _ in reader)
+                    row_count = sum(_count_csv_rows(filepath) for filepath in files)
                     files_note = f" ({len(files)} files)" if len(files) > 1 else ""
-                    print(f"     Exists: True ({row_count} rows){files_note}")
+                    emit(f"     Exists: True ({row_count} rows){files_note}")
                 except Exception:
-                    print(f"     Exists: True")
+                    emit(f"     Exists: True")
             else:
-                print(f"     Exists: False")
+                emit(f"     Exists: False")
 
             if source.get('type'):
-                print(f"     Type: {source['type']}")
+                emit(f"     Type: {source['type']}")
             if source.get('format'):
-                print(f"     Format: {source['format']}")
+                emit(f"     Format: {source['format']}")
 
             # Explain what supplemental means
             if is_supplemental:
-                print(f"     {C.DIM}Purpose: Query-only (no transactions generated){C.RESET}")
+                emit(f"     {C.DIM}Purpose: Query-only (no transactions generated){C.RESET}")
 
-            # Show format spec details if available
+            # Show format spec details if available (the line text is
+            # cached on the spec, so repeated diags don't rebuild it)
             format_spec = source.get('_format_spec')
             if format_spec:
-                print(f"     Columns:")
-                print(f"       date: column {format_spec.date_column} (format: {format_spec.date_format})")
-                print(f"       amount: column {format_spec.amount_column}")
-                if format_spec.description_column is not None:
-                    print(f"       description: column {format_spec.description_column}")
-                if format_spec.custom_captures:
-                    for name, col in format_spec.custom_captures.items():
-                        print(f"       {name}: column {col} (custom capture)")
-                if format_spec.description_template:
-                    print(f"     Description template: {format_spec.description_template}")
-                if format_spec.negate_amount:
-                    print(f"     Amount negation: enabled")
-            print()
+                for line in format_spec.diag_lines:
+                    emit(f"     {line}")
+            emit('')
 
     # PARSING HEALTH - test-parse each source and report issues
-    if config and config.get('data_sources'):
-        print("PARSING HEALTH")
-        print("-" * 70)
-        print("  Testing sample rows from each data source...")
-        print()
-
-        rule_mode = config.get('rule_mode', 'first_match')
-        transforms = get_transforms(config.get('_merchants_file'), match_mode=rule_mode)
+    if data_sources:
+        emit("PARSING HEALTH")
+        emit("-" * 70)
+        emit("  Testing sample rows from each data source...")
+        emit('')
 
-        for i, source in enumerate(config['data_sources'], 1):
+        for i, source in enumerate(data_sources, 1):
             # Skip supplemental sources
             if source.get('supplemental', False):
                 continue
@@ -280,15 +404,15 @@ def cmd_diag(args):
             format_spec = source.get('_format_spec')
 
             if not files:
-                print(f"  {i}. {source.get('name', 'unnamed')}")
-                print(f"     {C.RED}✗{C.RESET} Cannot test - file not found")
-                print()
+                emit(f"  {i}. {source.get('name', 'unnamed')}")
+                emit(f"     {C.RED}✗{C.RESET} Cannot test - file not found")
+                emit('')
                 continue
 
             if not format_spec:
-                print(f"  {i}. {source.get('name', 'unnamed')}")
-                print(f"     {C.YELLOW}⚠{C.RESET} Cannot test - no format spec (legacy parser?)")
-                print()
+                emit(f"  {i}. {source.get('name', 'unnamed')}")
+                emit(f"     {C.YELLOW}⚠{C.RESET} Cannot test - no format spec (legacy parser?)")
+                emit('')
                 continue
 
             # Test-parse first file (limit to first 20 rows for speed)
@@ -305,17 +429,17 @@ def cmd_diag(args):
                 txn_count = len(result.transactions)
                 skip_count = len(result.skipped_rows)
 
-                print(f"  {i}. {source.get('name', 'unnamed')} ({filename})")
+                emit(f"  {i}. {source.get('name', 'unnamed')} ({filename})")
 
                 if skip_count == 0:
-                    print(f"     {C.GREEN}✓{C.RESET} Parsed {txn_count} transactions successfully")
+                    emit(f"     {C.GREEN}✓{C.RESET} Parsed {txn_count} transactions successfully")
                 else:
                     total = txn_count + skip_count
                     pct = (txn_count / total * 100) if total > 0 else 0
                     if txn_count == 0:
-                        print(f"     {C.RED}✗{C.RESET} 0/{total} rows parsed ({skip_count} skipped)")
+                        emit(f"     {C.RED}✗{C.RESET} 0/{total} rows parsed ({skip_count} skipped)")
                     else:
-                        print(f"     {C.YELLOW}⚠{C.RESET} {txn_count}/{total} rows parsed ({skip_count} skipped)")
+                        emit(f"     {C.YELLOW}⚠{C.RESET} {txn_count}/{total} rows parsed ({skip_count} skipped)")
 
                     # Show breakdown by reason
                     reason_counts = Counter(s.reason for s in result.skipped_rows)
@@ -332,10 +456,10 @@ def cmd_diag(args):
                     # Show individual errors (limit to 5)
                     shown = 0
                     for skip in result.skipped_rows[:5]:
-                        print(f"       {filename}:{skip.line_number}: {skip.message}")
+                        emit(f"       {filename}:{skip.line_number}: {skip.message}")
                         shown += 1
                     if len(result.skipped_rows) > 5:
-                        print(f"       ... and {len(result.skipped_rows) - 5} more")
+                        emit(f"       ... and {len(result.skipped_rows) - 5} more")
 
                     # Provide hints based on error type
                     if 'date_parse_error' in reason_counts:
@@ -345,245 +469,208 @@ def cmd_diag(args):
                                 # Look for 2-digit year pattern in the error
                                 if "'" in skip.message:
                                     date_val = skip.message.split("'")[1]
-                                    import re
                                     if re.match(r'^\d{1,2}/\d{1,2}/\d{2}$', date_val):
-                                        print()
-                                        print(f"     {C.CYAN}Hint:{C.RESET} Dates look like 2-digit year (e.g., '{date_val}')")
+                                        emit('')
+                                        emit(f"     {C.CYAN}Hint:{C.RESET} Dates look like 2-digit year (e.g., '{date_val}')")
                                         suggested = format_spec.date_format.replace('%Y', '%y')
-                                        print(f"           Try: format: \"{{date:{suggested}}},{{description}},{{amount}}\"")
+                                        emit(f"           Try: format: \"{{date:{suggested}}},{{description}},{{amount}}\"")
                                         break
 
             except Exception as e:
-                print(f"  {i}. {source.get('name', 'unnamed')} ({filename})")
-                print(f"     {C.RED}✗{C.RESET} Error: {e}")
+                emit(f"  {i}. {source.get('name', 'unnamed')} ({filename})")
+                emit(f"     {C.RED}✗{C.RESET} Error: {e}")
 
-            print()
+            emit('')
 
     # Merchant rules diagnostics
-    print("MERCHANT RULES")
-    print("-" * 70)
-
-    merchants_file = config.get('_merchants_file') if config else None
-    merchants_format = config.get('_merchants_format') if config else None
+    emit("MERCHANT RULES")
+    emit("-" * 70)
 
-    if merchants_file and os.path.exists(merchants_file):
-        print(f"Merchants file: {merchants_file}")
-        print(f"  Format: {merchants_format or 'unknown'}")
-        print(f"  Exists: True")
+    if merchants_file and _path_exists(merchants_file):
+        emit(f"Merchants file: {merchants_file}")
+        emit(f"  Format: {merchants_format or 'unknown'}")
+        emit(f"  Exists: True")
 
-        # Get file stats
-        file_size = os.path.getsize(merchants_file)
-        print(f"  File size: {file_size} bytes")
+        # Get file stats - reuse the scandir entry when the file lives in
+        # config_dir (DirEntry.stat is served from the listing, no syscall)
+        entry = (config_entries.get(os.path.basename(merchants_file))
+                 if os.path.dirname(merchants_file) == config_dir else None)
+        file_size = entry.stat().st_size if entry is not None else os.path.getsize(merchants_file)
+        emit(f"  File size: {file_size} bytes")
 
         if merchants_format == 'new':
             # New .rules format
             try:
                 from ..merchant_engine import load_merchants_file
                 from pathlib import Path
-                import re
                 engine = load_merchants_file(Path(merchants_file))
-                print(f"  Rules loaded: {len(engine.rules)}")
+                emit(f"  Rules loaded: {len(engine.rules)}")
 
-                # Tag statistics
-                rules_with_tags = sum(1 for r in engine.rules if r.tags)
+                # One pass over the rules builds every aggregate plus the
+                # per-rule badge string the render loop below reuses,
+                # instead of six separate scans (and a second regex match
+                # per rule at render time)
+                rules_with_tags = 0
                 all_tags = set()
+                rules_with_cross_source = []
+                rules_with_let = []
+                rules_with_field = []
+                rule_badges = {}
                 for r in engine.rules:
-                    all_tags.update(r.tags)
-
-                # Cross-source query detection (list comprehensions referencing data sources)
-                def uses_cross_source(expr):
-                    """Check if expression uses list comprehension syntax."""
-                    return bool(re.search(r'\[.*\bfor\b.*\bin\b.*\]', expr) or
-                                re.search(r'\b(any|sum|len|next)\s*\(.*\bfor\b.*\bin\b', expr))
-
-                rules_with_cross_source = [r for r in engine.rules if uses_cross_source(r.match_expr)]
-                rules_with_let = [r for r in engine.rules if r.let_bindings]
-                rules_with_field = [r for r in engine.rules if r.fields]
+                    if r.tags:
+                        rules_with_tags += 1
+                        all_tags.update(r.tags)
+                    badges = []
+                    if _CROSS_SOURCE_RE.search(r.match_expr):
+                        rules_with_cross_source.append(r)
+                        badges.append(f"{C.CYAN}cross-source{C.RESET}")
+                    if r.let_bindings:
+                        rules_with_let.append(r)
+                        badges.append(f"{C.CYAN}let{C.RESET}")
+                    if r.fields:
+                        rules_with_field.append(r)
+                        badges.append(f"{C.CYAN}field{C.RESET}")
+                    rule_badges[id(r)] = f" [{', '.join(badges)}]" if badges else ""
 
                 # Special tags that affect spending analysis (from classification module)
                 special_tags_used = all_tags & SPECIAL_TAGS
 
-                print()
+                emit('')
                 if rules_with_tags > 0:
                     pct = (rules_with_tags / len(engine.rules) * 100) if engine.rules else 0
-                    print(f"  Rules with tags: {rules_with_tags}/{len(engine.rules)} ({pct:.0f}%)")
+                    emit(f"  Rules with tags: {rules_with_tags}/{len(engine.rules)} ({pct:.0f}%)")
                     if all_tags:
-                        # Show special tags in cyan, others normally
-                        tag_strs = []
-                        for tag in sorted(all_tags):
-                            if tag in SPECIAL_TAGS:
-                                tag_strs.append(f"{C.CYAN}{tag}{C.RESET}")
-                            else:
-                                tag_strs.append(tag)
-                        print(f"  Unique tags: {', '.join(tag_strs)}")
+                        # Split once with set operations instead of a
+                        # per-tag membership test: special tags render
+                        # first in cyan, the rest follow plain
+                        tag_strs = [f"{C.CYAN}{tag}{C.RESET}"
+                                    for tag in sorted(special_tags_used)]
+                        tag_strs += sorted(all_tags - SPECIAL_TAGS)
+                        emit(f"  Unique tags: {', '.join(tag_strs)}")
 
                 # Show advanced feature usage
                 if rules_with_cross_source or rules_with_let or rules_with_field:
-                    print()
-                    print(f"  {C.BOLD}Advanced Features:{C.RESET}")
+                    emit('')
+                    emit(f"  {C.BOLD}Advanced Features:{C.RESET}")
                     if rules_with_cross_source:
-                        print(f"    {C.GREEN}✓{C.RESET} Cross-source queries: {len(rules_with_cross_source)} rule(s)")
+                        emit(f"    {C.GREEN}✓{C.RESET} Cross-source queries: {len(rules_with_cross_source)} rule(s)")
                         for r in rules_with_cross_source[:3]:
-                            print(f"      {C.DIM}[{r.name}]{C.RESET}")
+                            emit(f"      {C.DIM}[{r.name}]{C.RESET}")
                         if len(rules_with_cross_source) > 3:
-                            print(f"      {C.DIM}... and {len(rules_with_cross_source) - 3} more{C.RESET}")
+                            emit(f"      {C.DIM}... and {len(rules_with_cross_source) - 3} more{C.RESET}")
                     if rules_with_let:
-                        print(f"    {C.GREEN}✓{C.RESET} let: bindings: {len(rules_with_let)} rule(s)")
+                        emit(f"    {C.GREEN}✓{C.RESET} let: bindings: {len(rules_with_let)} rule(s)")
                     if rules_with_field:
-                        print(f"    {C.GREEN}✓{C.RESET} field: directives: {len(rules_with_field)} rule(s)")
+                        emit(f"    {C.GREEN}✓{C.RESET} field: directives: {len(rules_with_field)} rule(s)")
 
                 # Show special tag usage
-                print()
-                print(f"  {C.BOLD}Special Tags:{C.RESET} (affect spending analysis)")
+                emit('')
+                emit(f"  {C.BOLD}Special Tags:{C.RESET} (affect spending analysis)")
                 for tag, desc in [('income', 'exclude deposits/salary'), ('refund', 'net against merchant'), ('transfer', 'exclude account transfers')]:
                     if tag in special_tags_used:
-                        print(f"    {C.GREEN}✓{C.RESET} {C.CYAN}{tag}{C.RESET}: {C.DIM}{desc}{C.RESET}")
+                        emit(f"    {C.GREEN}✓{C.RESET} {C.CYAN}{tag}{C.RESET}: {C.DIM}{desc}{C.RESET}")
                     else:
-                        print(f"    {C.DIM}○ {tag}: {desc}{C.RESET}")
+                        emit(f"    {C.DIM}○ {tag}: {desc}{C.RESET}")
 
-                print()
-                print("  MERCHANT RULES (all):")
+                emit('')
+                emit("  MERCHANT RULES (all):")
                 for rule in engine.rules:
-                    # Show badges for advanced features
-                    badges = []
-                    if uses_cross_source(rule.match_expr):
-                        badges.append(f"{C.CYAN}cross-source{C.RESET}")
-                    if rule.let_bindings:
-                        badges.append(f"{C.CYAN}let{C.RESET}")
-                    if rule.fields:
-                        badges.append(f"{C.CYAN}field{C.RESET}")
-                    badge_str = f" [{', '.join(badges)}]" if badges else ""
-                    print(f"    [{rule.name}]{badge_str}")
-                    print(f"      match: {rule.match_expr}")
-                    print(f"      category: {rule.category} > {rule.subcategory}")
+                    # Badges for advanced features (computed in the scan above)
+                    emit(f"    [{rule.name}]{rule_badges[id(rule)]}")
+                    emit(f"      match: {rule.match_expr}")
+                    emit(f"      category: {rule.category} > {rule.subcategory}")
                     if rule.let_bindings:
                         for var, expr in rule.let_bindings:
-                            print(f"      let: {var} = {expr}")
+                            emit(f"      let: {var} = {expr}")
                     if rule.fields:
                         for name, expr in rule.fields.items():
-                            print(f"      field: {name} = {expr}")
+                            emit(f"      field: {name} = {expr}")
                     if rule.tags:
-                        print(f"      tags: {', '.join(rule.tags)}")
+                        emit(f"      tags: {', '.join(rule.tags)}")
             except Exception as e:
-                print(f"  Error loading rules: {e}")
+                emit(f"  Error loading rules: {e}")
         else:
             # Legacy CSV format
             rules_path = merchants_file
             diag = diagnose_rules(rules_path)
-            print(f"  Rules loaded: {diag['user_rules_count']}")
-            print()
-            print(f"  {C.YELLOW}NOTE: Using legacy CSV format. Run 'tally up --migrate' to upgrade.{C.RESET}")
+            emit(f"  Rules loaded: {diag['user_rules_count']}")
+            emit('')
+            emit(f"  {C.YELLOW}NOTE: Using legacy CSV format. Run 'tally up --migrate' to upgrade.{C.RESET}")
 
             if diag['user_rules_errors']:
-                print()
-                print("  ERRORS/WARNINGS:")
+                emit('')
+                emit("  ERRORS/WARNINGS:")
                 for err in diag['user_rules_errors']:
-                    print(f"    - {err}")
+                    emit(f"    - {err}")
 
             if diag.get('rules_with_tags', 0) > 0:
-                print()
+                emit('')
                 pct = (diag['rules_with_tags'] / diag['user_rules_count'] * 100) if diag['user_rules_count'] > 0 else 0
-                print(f"  Rules with tags: {diag['rules_with_tags']}/{diag['user_rules_count']} ({pct:.0f}%)")
+                emit(f"  Rules with tags: {diag['rules_with_tags']}/{diag['user_rules_count']} ({pct:.0f}%)")
                 if diag.get('unique_tags'):
-                    print(f"  Unique tags: {', '.join(sorted(diag['unique_tags']))}")
+                    emit(f"  Unique tags: {', '.join(sorted(diag['unique_tags']))}")
 
             if diag['user_rules']:
-                print()
-                print("  MERCHANT RULES (CSV format):")
+                emit('')
+                emit("  MERCHANT RULES (CSV format):")
                 for rule in diag['user_rules']:
                     if len(rule) == 5:
                         pattern, merchant, category, subcategory, tags = rule
                     else:
                         pattern, merchant, category, subcategory = rule
                         tags = []
-                    print(f"    {pattern}")
+                    emit(f"    {pattern}")
                     tags_str = f" [{', '.join(tags)}]" if tags else ""
-                    print(f"      -> {merchant} | {category} > {subcategory}{tags_str}")
+                    emit(f"      -> {merchant} | {category} > {subcategory}{tags_str}")
     else:
-        print("Merchants file: not configured")
-        print()
-        print("  No merchant rules found.")
-        print("  Add 'merchants_file: config/merchants.rules' to settings.yaml")
-        print("  Transactions will be categorized as 'Unknown'.")
-    print()
+        emit("Merchants file: not configured")
+        emit('')
+        emit("  No merchant rules found.")
+        emit("  Add 'merchants_file: config/merchants.rules' to settings.yaml")
+        emit("  Transactions will be categorized as 'Unknown'.")
+    emit('')
 
     # Views configuration
-    print("VIEWS")
-    print("-" * 70)
-    views_file_setting = config.get('views_file') if config else None
+    emit("VIEWS")
+    emit("-" * 70)
     if views_file_setting:
         # Resolve path relative to budget directory (parent of config dir)
-        budget_dir = os.path.dirname(config_dir)
         views_path = os.path.join(budget_dir, views_file_setting)
-        print(f"Configured in settings.yaml: {views_file_setting}")
-        print(f"  Resolved path: {views_path}")
-        print(f"  Exists: {os.path.exists(views_path)}")
-        if os.path.exists(views_path):
+        emit(f"Configured in settings.yaml: {views_file_setting}")
+        emit(f"  Resolved path: {views_path}")
+        views_exists = _path_exists(views_path)
+        emit(f"  Exists: {views_exists}")
+        if views_exists:
             try:
                 from ..section_engine import load_sections
                 views_config = load_sections(views_path)
-                print(f"  Views defined: {len(views_config.sections)}")
+                emit(f"  Views defined: {len(views_config.sections)}")
                 if views_config.global_variables:
-                    print()
-                    print("  Global variables:")
+                    emit('')
+                    emit("  Global variables:")
                     for name, expr in views_config.global_variables.items():
-                        print(f"    {name} = {expr}")
-                print()
-                print("  Views:")
+                        emit(f"    {name} = {expr}")
+                emit('')
+                emit("  Views:")
                 for view in views_config.sections:
-                    print(f"    [{view.name}]")
+                    emit(f"    [{view.name}]")
                     if view.description:
-                        print(f"      description: {view.description}")
-                    print(f"      filter: {view.filter_expr}")
+                        emit(f"      description: {view.description}")
+                    emit(f"      filter: {view.filter_expr}")
             except Exception as e:
-                print(f"  Error loading views: {e}")
+                emit(f"  Error loading views: {e}")
         else:
-            print()
-            print("  WARNING: Views file not found!")
-            print(f"  Create {views_file_setting} or remove views_file from settings.yaml")
+            emit('')
+            emit("  WARNING: Views file not found!")
+            emit(f"  Create {views_file_setting} or remove views_file from settings.yaml")
     else:
-        print("Not configured (optional)")
-        print("  To enable views, add to settings.yaml:")
-        print("    views_file: config/views.rules")
-        print()
-        print("  Then create the file with view definitions. Example:")
-        print("    [Every Month]")
-        print("    filter: months >= 6 and cv < 0.3")
-    print()
-
-    # JSON output option
-    if args.format == 'json':
-        print("JSON OUTPUT")
-        print("-" * 70)
-        diag = diagnose_rules(merchants_file) if merchants_file else {'user_rules_path': None, 'user_rules_exists': False, 'user_rules_count': 0, 'user_rules': [], 'user_rules_errors': [], 'total_rules': 0}
-        output = {
-            'config_dir': config_dir,
-            'config_dir_exists': os.path.isdir(config_dir),
-            'settings_file': settings_path,
-            'settings_exists': os.path.exists(settings_path),
-            'data_sources': [],
-            'rules': {
-                'user_rules_path': diag['user_rules_path'],
-                'user_rules_exists': diag['user_rules_exists'],
-                'user_rules_count': diag['user_rules_count'],
-                'user_rules': [
-                    {'pattern': r[0], 'merchant': r[1], 'category': r[2], 'subcategory': r[3], 'tags': r[4] if len(r) > 4 else []}
-                    for r in diag['user_rules']
-                ],
-                'errors': diag['user_rules_errors'],
-                'total_rules': diag['total_rules'],
-                'rules_with_tags': diag.get('rules_with_tags', 0),
-                'unique_tags': sorted(diag.get('unique_tags', set())),
-            }
-        }
-        if config and config.get('data_sources'):
-            for source in config['data_sources']:
-                filepath = os.path.join(os.path.dirname(config_dir), source['file'])
-                output['data_sources'].append({
-                    'name': source.get('name'),
-                    'file': source['file'],
-                    'exists': os.path.exists(filepath),
-                    'type': source.get('type'),
-                    'format': source.get('format'),
-                })
-        print(json_module.dumps(output, indent=2))
+        emit("Not configured (optional)")
+        emit("  To enable views, add to settings.yaml:")
+        emit("    views_file: config/views.rules")
+        emit('')
+        emit("  Then create the file with view definitions. Example:")
+        emit("    [Every Month]")
+        emit("    filter: months >= 6 and cv < 0.3")
+    emit('')
+
+    sys.stdout.write('\n'.join(out) + '\n')
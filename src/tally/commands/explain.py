@@ -2,8 +2,14 @@
 Tally 'explain' command - Show merchant categorization and matching rules.
 """
 
+import functools
+import heapq
+import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 from ..colors import C
 from ..cli_utils import (
@@ -14,15 +20,87 @@ from ..cli_utils import (
 )
 from ..path_utils import resolve_data_source_paths
 from ..config_loader import load_config
+from datetime import datetime
+
 from ..merchant_utils import get_all_rules, get_transforms, explain_description
 from ..analyzer import parse_amex, parse_boa, parse_generic_csv
 from ..analyzer import analyze_transactions, export_json, export_markdown, build_merchant_json
+from ..analyzer import classify_by_sections
+from ..section_engine import load_sections, evaluate_section_filter, evaluate_variables
+
+# Patterns used by the month filter and match-expression helpers -
+# compiled once at import instead of hitting the re cache per call
+_MONTH_YM_RE = re.compile(r'^\d{4}-\d{2}$')
+_MONTH_NUM_RE = re.compile(r'^\d{1,2}$')
+_MATCH_FN_RE = re.compile(r'^(normalized|anyof|startswith|fuzzy|contains|regex)\s*\(')
+_SIMPLE_UPPER_RE = re.compile(r'^[A-Z0-9\s]+$')
+_NORMALIZED_ARG_RE = re.compile(r'normalized\s*\(\s*"([^"]+)"\s*\)')
+_ANYOF_ARGS_RE = re.compile(r'anyof\s*\(([^)]+)\)')
+_STARTSWITH_ARG_RE = re.compile(r'startswith\s*\(\s*"([^"]+)"\s*\)')
+_FUZZY_ARGS_RE = re.compile(r'fuzzy\s*\(\s*"([^"]+)"(?:\s*,\s*([0-9.]+))?\s*\)')
+_LIST_COMP_RE = re.compile(r'\[.*\bfor\b\s+\w+\s+\bin\b\s+(\w+)')
+_AGG_FUNC_RES = {func: re.compile(rf'\b{func}\s*\(.*\bfor\b\s+\w+\s+\bin\b\s+(\w+)')
+                 for func in ('any', 'sum', 'len', 'next')}
+
+# Month-name lookup for the --month filter, built once at import
+_MONTH_NAMES = {
+    'jan': '01', 'january': '01',
+    'feb': '02', 'february': '02',
+    'mar': '03', 'march': '03',
+    'apr': '04', 'april': '04',
+    'may': '05',
+    'jun': '06', 'june': '06',
+    'jul': '07', 'july': '07',
+    'aug': '08', 'august': '08',
+    'sep': '09', 'september': '09',
+    'oct': '10', 'october': '10',
+    'nov': '11', 'november': '11',
+    'dec': '12', 'december': '12',
+}
+
+# RapidFuzz scores in native code and is an order of magnitude faster
+# than difflib on large merchant lists; it is purely opportunistic -
+# not a declared dependency - so difflib remains the fallback.
+try:
+    from rapidfuzz import process as _rf_process, fuzz as _rf_fuzz
+except ImportError:
+    _rf_process = None
+
+
+def _parse_generic_txns(filepath, format_spec, rules, source, transforms):
+    """Parse one generic CSV and return its transactions (thread-pool job)."""
+    result = parse_generic_csv(filepath, format_spec, rules,
+                               source_name=source.get('name', 'CSV'),
+                               decimal_separator=source.get('decimal_separator', '.'),
+                               transforms=transforms)
+    return result.transactions
+
+
+def _close_matches(query, candidates, n=3):
+    """Return up to n fuzzy matches for query among candidates."""
+    if _rf_process is not None:
+        return [match for match, _score, _idx in _rf_process.extract(
+            query, candidates, scorer=_rf_fuzz.WRatio, limit=n, score_cutoff=60)]
+    from difflib import get_close_matches
+    return get_close_matches(query, candidates, n=n, cutoff=0.6)
+
+
+class _TxnGroup:
+    """Per-merchant aggregate for the transaction-search fallback -
+    slots keep it smaller than a dict and field access is a fixed-offset
+    load instead of a hash lookup."""
+    __slots__ = ('count', 'total', 'category', 'subcategory', 'txns')
+
+    def __init__(self, category, subcategory):
+        self.count = 0
+        self.total = 0.0
+        self.category = category
+        self.subcategory = subcategory
+        self.txns = []
 
 
 def cmd_explain(args):
     """Handle the 'explain' subcommand - show merchant categorization and matching rules."""
-    from difflib import get_close_matches
-
     # Handle merchant args - check if last arg looks like a config path
     merchant_names = args.merchant if args.merchant else []
 
@@ -59,8 +137,11 @@ def cmd_explain(args):
     else:
         rules = get_all_rules(match_mode=rule_mode)
 
-    # Parse transactions (quietly)
-    all_txns = []
+    # Parse transactions (quietly). One parse job per file, run on a
+    # small thread pool as in discover; results are collected in
+    # submission order so output stays deterministic, and deprecation
+    # warnings are recorded on the main thread.
+    jobs = []
     for source in data_sources:
         source_files, _ = resolve_data_source_paths(config_dir, source.get('file'))
         if not source_files:
@@ -70,26 +151,33 @@ def cmd_explain(args):
         format_spec = source.get('_format_spec')
 
         for filepath in source_files:
+            if parser_type == 'amex':
+                warn_deprecated_parser(source.get('name', 'AMEX'), 'amex', filepath)
+                jobs.append(functools.partial(parse_amex, filepath, rules))
+            elif parser_type == 'boa':
+                warn_deprecated_parser(source.get('name', 'BOA'), 'boa', filepath)
+                jobs.append(functools.partial(parse_boa, filepath, rules))
+            elif parser_type == 'generic' and format_spec:
+                jobs.append(functools.partial(_parse_generic_txns, filepath,
+                                              format_spec, rules, source, transforms))
+            else:
+                break
+
+    all_txns = []
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+            for future in [executor.submit(job) for job in jobs]:
+                try:
+                    all_txns.extend(future.result())
+                except Exception:
+                    continue
+    else:
+        for job in jobs:
             try:
-                if parser_type == 'amex':
-                    warn_deprecated_parser(source.get('name', 'AMEX'), 'amex', filepath)
-                    txns = parse_amex(filepath, rules)
-                elif parser_type == 'boa':
-                    warn_deprecated_parser(source.get('name', 'BOA'), 'boa', filepath)
-                    txns = parse_boa(filepath, rules)
-                elif parser_type == 'generic' and format_spec:
-                    result = parse_generic_csv(filepath, format_spec, rules,
-                                               source_name=source.get('name', 'CSV'),
-                                               decimal_separator=source.get('decimal_separator', '.'),
-                                               transforms=transforms)
-                    txns = result.transactions
-                else:
-                    break
+                all_txns.extend(job())
             except Exception:
                 continue
 
-            all_txns.extend(txns)
-
     if not all_txns:
         print("Error: No transactions found", file=sys.stderr)
         sys.exit(1)
@@ -100,15 +188,14 @@ def cmd_explain(args):
     # Get all merchants from by_merchant (the unified view)
     all_merchants = stats.get('by_merchant', {})
 
-    # Load views config for view matching
+    # Load views config for view matching - no exists() probe, the open
+    # inside load_sections answers it (views are optional either way)
     views_config = None
     views_file = os.path.join(config_dir, 'views.rules')
-    if os.path.exists(views_file):
-        try:
-            from ..section_engine import load_sections
-            views_config = load_sections(views_file)
-        except Exception:
-            pass  # Views are optional
+    try:
+        views_config = load_sections(views_file)
+    except Exception:
+        pass  # Views are optional
 
     verbose = args.verbose
 
@@ -116,22 +203,35 @@ def cmd_explain(args):
     if merchant_names:
         # Explain specific merchants
         found_any = False
+        # Lowercased (description, raw_description, txn) triples for the
+        # substring fallback - built once on first use instead of
+        # re-lowercasing every transaction per query
+        txn_search_index = None
+        # Lowercased merchant names, built once for all queries: the map
+        # answers case-insensitive lookups with one dict hit, the pairs
+        # drive the substring scan without re-lowercasing each key
+        merchant_keys = list(all_merchants)
+        merchant_lc_pairs = [(name.lower(), name) for name in merchant_keys]
+        merchant_lc_map = {}
+        for name_lc, name in merchant_lc_pairs:
+            merchant_lc_map.setdefault(name_lc, name)
         for merchant_query in merchant_names:
             # Try exact match first
             if merchant_query in all_merchants:
                 found_any = True
                 _print_merchant_explanation(merchant_query, all_merchants[merchant_query], args.format, verbose, stats['num_months'], views_config)
             else:
+                query_lower = merchant_query.lower()
+
                 # Try case-insensitive match
-                matches = [m for m in all_merchants.keys() if m.lower() == merchant_query.lower()]
-                if matches:
+                match = merchant_lc_map.get(query_lower)
+                if match is not None:
                     found_any = True
-                    _print_merchant_explanation(matches[0], all_merchants[matches[0]], args.format, verbose, stats['num_months'], views_config)
+                    _print_merchant_explanation(match, all_merchants[match], args.format, verbose, stats['num_months'], views_config)
                     continue
 
                 # Try substring match on merchant names (partial search)
-                query_lower = merchant_query.lower()
-                partial_matches = [m for m in all_merchants.keys() if query_lower in m.lower()]
+                partial_matches = [name for name_lc, name in merchant_lc_pairs if query_lower in name_lc]
                 if partial_matches:
                     found_any = True
                     print(f"Merchants matching '{merchant_query}':\n")
@@ -140,36 +240,50 @@ def cmd_explain(args):
                     continue
 
                 # Search transactions containing the query
-                matching_txns = [t for t in all_txns if query_lower in t.get('description', '').lower()
-                                 or query_lower in t.get('raw_description', '').lower()]
+                if txn_search_index is None:
+                    txn_search_index = [
+                        (t.get('description', '').lower(),
+                         t.get('raw_description', '').lower(), t)
+                        for t in all_txns
+                    ]
+                matching_txns = [t for desc_lc, raw_lc, t in txn_search_index
+                                 if query_lower in desc_lc or query_lower in raw_lc]
                 if matching_txns:
                     found_any = True
                     # Group by merchant and show
                     by_merchant = {}
                     for t in matching_txns:
                         m = t['merchant']
-                        if m not in by_merchant:
-                            by_merchant[m] = {'count': 0, 'total': 0, 'category': t['category'], 'subcategory': t['subcategory'], 'txns': []}
-                        by_merchant[m]['count'] += 1
-                        by_merchant[m]['total'] += t['amount']
-                        by_merchant[m]['txns'].append(t)
+                        # One outer lookup per txn; fields mutate through
+                        # the bound entry
+                        entry = by_merchant.get(m)
+                        if entry is None:
+                            entry = by_merchant[m] = _TxnGroup(t['category'], t['subcategory'])
+                        entry.count += 1
+                        entry.total += t['amount']
+                        entry.txns.append(t)
                     print(f"Transactions matching '{merchant_query}':\n")
                     # Special categories excluded from spending analysis
                     excluded_categories = {'Transfers', 'Payments', 'Cash'}
-                    for m, data in sorted(by_merchant.items(), key=lambda x: abs(x[1]['total']), reverse=True):
-                        cat = f"{data['category']} > {data['subcategory']}"
+                    # Decorate with the abs total once so the sort key is a
+                    # plain C-level tuple lookup
+                    ranked = [(abs(g.total), m, g) for m, g in by_merchant.items()]
+                    ranked.sort(key=itemgetter(0), reverse=True)
+                    for _abs_total, m, data in ranked:
+                        cat = f"{data.category} > {data.subcategory}"
                         excluded_note = ""
-                        if data['category'] in excluded_categories:
+                        if data.category in excluded_categories:
                             excluded_note = " [excluded from spending]"
-                        print(f"  {m:<30} {cat:<25} ({data['count']} txns, ${abs(data['total']):,.0f}){excluded_note}")
+                        print(f"  {m:<30} {cat:<25} ({data.count} txns, ${abs(data.total):,.0f}){excluded_note}")
                         if verbose >= 2:
-                            # Show individual transactions
-                            sorted_txns = sorted(data['txns'], key=lambda x: x['date'], reverse=True)
-                            for t in sorted_txns[:10]:  # Limit to 10 most recent
+                            # Show the 10 most recent - a heap selection,
+                            # not a full sort of the group
+                            txns = data.txns
+                            for t in heapq.nlargest(10, txns, key=itemgetter('date')):
                                 date_str = t['date'].strftime('%m/%d') if hasattr(t['date'], 'strftime') else str(t['date'])
                                 print(f"      {date_str}  ${abs(t['amount']):>10,.2f}  {t.get('raw_description', t['description'])[:50]}")
-                            if len(sorted_txns) > 10:
-                                print(f"      ... and {len(sorted_txns) - 10} more")
+                            if len(txns) > 10:
+                                print(f"      ... and {len(txns) - 10} more")
                     print()
                     continue
 
@@ -182,7 +296,7 @@ def cmd_explain(args):
                     _print_description_explanation(merchant_query, trace, args.format, verbose)
                 else:
                     # Try fuzzy match on merchant names
-                    close_matches = get_close_matches(merchant_query, list(all_merchants.keys()), n=3, cutoff=0.6)
+                    close_matches = _close_matches(merchant_query, merchant_keys)
                     if close_matches:
                         print(f"No merchant matching '{merchant_query}'. Did you mean:", file=sys.stderr)
                         for m in close_matches:
@@ -215,7 +329,6 @@ def cmd_explain(args):
                 print("No views.rules found. Create config/views.rules to define custom views.")
                 sys.exit(1)
 
-            from ..analyzer import classify_by_sections
             view_results = classify_by_sections(
                 matching_merchants,
                 views_config_local,
@@ -239,47 +352,62 @@ def cmd_explain(args):
             matching_merchants = {name: data for name, data in merchants_list}
             active_filters.append(f"view:{view_match}")
 
-        # Apply category filter
+        # Category, tags, and month filters are fused into one pass:
+        # each active filter contributes a predicate, and the merchant
+        # dict is rebuilt once instead of once per filter.
+        preds = []
+
+        # Category filter: query lowered once, each merchant's category
+        # cached lowercase as with tags
         if has_category:
             category = args.category
-            # Case-insensitive category match
-            matching_merchants = {
-                k: v for k, v in matching_merchants.items()
-                if v.get('category', '').lower() == category.lower()
-            }
+            category_lower = category.lower()
+            for v in matching_merchants.values():
+                if '_cat_lc' not in v:
+                    v['_cat_lc'] = v.get('category', '').lower()
+            preds.append(lambda k, v: v['_cat_lc'] == category_lower)
             active_filters.append(f"category:{category}")
 
-        # Apply tags filter
+        # Tags filter: lowercased tag sets are cached on the merchant
+        # dicts so the predicate intersects prebuilt frozensets
         if has_tags:
             filter_tags = set(t.strip().lower() for t in args.tags.split(','))
-            matching_merchants = {
-                k: v for k, v in matching_merchants.items()
-                if set(t.lower() for t in v.get('tags', [])) & filter_tags
-            }
+            for v in matching_merchants.values():
+                if '_tags_lc' not in v:
+                    v['_tags_lc'] = frozenset(t.lower() for t in v.get('tags', []))
+            preds.append(lambda k, v: v['_tags_lc'] & filter_tags)
             active_filters.append(f"tags:{','.join(sorted(filter_tags))}")
 
-        # Apply month filter
+        month_idx = None
+
+        # Month filter: invert the data once into month -> merchant
+        # names; one pass serves both the available-months listing and
+        # the membership predicate.
         if has_month:
-            # Collect available months from data
-            available_months = set()
-            for data in by_merchant.values():
-                for txn in data.get('transactions', []):
-                    if txn.get('month'):
-                        available_months.add(txn['month'])
-
-            month_filter = _parse_month_filter(args.month, available_months)
+            month_idx = {}
+            for name, data in by_merchant.items():
+                for txn in data.get('transactions', ()):
+                    month = txn.get('month')
+                    if month:
+                        month_idx.setdefault(month, set()).add(name)
+
+            month_filter = _parse_month_filter(args.month, month_idx.keys())
             if month_filter:
-                matching_merchants = {
-                    k: v for k, v in matching_merchants.items()
-                    if _merchant_has_month(v, month_filter)
-                }
+                names_in_month = month_idx.get(month_filter, ())
+                preds.append(lambda k, v: k in names_in_month)
                 active_filters.append(f"month:{month_filter}")
             else:
                 print(f"No month matching '{args.month}' in data", file=sys.stderr)
-                if available_months:
-                    print(f"Available months: {', '.join(sorted(available_months))}", file=sys.stderr)
+                if month_idx:
+                    print(f"Available months: {', '.join(sorted(month_idx))}", file=sys.stderr)
                 sys.exit(1)
 
+        if preds:
+            matching_merchants = {
+                k: v for k, v in matching_merchants.items()
+                if all(p(k, v) for p in preds)
+            }
+
         # If no filters applied, show summary
         if not active_filters:
             _print_explain_summary(stats, verbose)
@@ -288,11 +416,12 @@ def cmd_explain(args):
             filter_desc = ' + '.join(active_filters)
 
             if args.format == 'json':
-                import json
                 merchants = [build_merchant_json(name, data, verbose) for name, data in matching_merchants.items()]
-                merchants.sort(key=lambda x: x['monthly_value'], reverse=True)
+                merchants.sort(key=itemgetter('monthly_value'), reverse=True)
                 output = {'filters': active_filters, 'merchants': merchants}
-                print(json.dumps(output, indent=2))
+                # Stream into the stdout buffer - no full-document string
+                json.dump(output, sys.stdout, indent=2)
+                print()
             else:
                 # Text format
                 if matching_merchants:
@@ -300,7 +429,7 @@ def cmd_explain(args):
                     _print_classification_summary('Filtered', matching_merchants, verbose, stats['num_months'])
                 else:
                     print(f"No merchants found matching: {filter_desc}")
-                    _suggest_available_values(by_merchant, has_category, has_tags, has_month)
+                    _suggest_available_values(by_merchant, has_category, has_tags, has_month, month_idx)
 
     print_deprecation_warnings(config)
 
@@ -319,100 +448,72 @@ def _parse_month_filter(month_str, available_months):
 
     Returns YYYY-MM string or None if invalid.
     """
-    import re
-
     month_str = month_str.strip()
 
     # Try YYYY-MM format (exact match)
-    if re.match(r'^\d{4}-\d{2}$', month_str):
+    if _MONTH_YM_RE.match(month_str):
         return month_str
 
-    month_names = {
-        'jan': '01', 'january': '01',
-        'feb': '02', 'february': '02',
-        'mar': '03', 'march': '03',
-        'apr': '04', 'april': '04',
-        'may': '05',
-        'jun': '06', 'june': '06',
-        'jul': '07', 'july': '07',
-        'aug': '08', 'august': '08',
-        'sep': '09', 'september': '09',
-        'oct': '10', 'october': '10',
-        'nov': '11', 'november': '11',
-        'dec': '12', 'december': '12',
-    }
-
     # Try month name - find matching month in available data
-    month_lower = month_str.lower()
-    if month_lower in month_names:
-        month_num = month_names[month_lower]
-        # Find all available months ending with this month number
-        matches = [m for m in available_months if m.endswith(f'-{month_num}')]
-        if len(matches) == 1:
-            return matches[0]
-        elif len(matches) > 1:
-            # Multiple years have this month - return most recent
-            return sorted(matches)[-1]
-        return None
+    month_num = _MONTH_NAMES.get(month_str.lower())
+    if month_num is not None:
+        return _latest_month_ending(available_months, f'-{month_num}')
 
     # Try month number - find matching month in available data
-    if re.match(r'^\d{1,2}$', month_str):
+    if _MONTH_NUM_RE.match(month_str):
         month_num = int(month_str)
         if 1 <= month_num <= 12:
-            month_suffix = f'-{month_num:02d}'
-            matches = [m for m in available_months if m.endswith(month_suffix)]
-            if len(matches) == 1:
-                return matches[0]
-            elif len(matches) > 1:
-                # Multiple years have this month - return most recent
-                return sorted(matches)[-1]
+            return _latest_month_ending(available_months, f'-{month_num:02d}')
         return None
 
     return None
 
 
-def _merchant_has_month(merchant_data, month_filter):
-    """Check if merchant has transactions in the specified month."""
-    transactions = merchant_data.get('transactions', [])
-    for txn in transactions:
-        txn_month = txn.get('month', '')
-        if txn_month == month_filter:
-            return True
-    return False
+def _latest_month_ending(available_months, month_suffix):
+    """Return the most recent available 'YYYY-MM' with this '-MM' suffix."""
+    matches = [m for m in available_months if m.endswith(month_suffix)]
+    if not matches:
+        return None
+    # Multiple years may have this month - max() gives the most recent
+    return max(matches)
 
 
-def _suggest_available_values(by_merchant, has_category, has_tags, has_month):
-    """Suggest available filter values when no matches found."""
-    if has_category:
-        all_categories = set(v.get('category') for v in by_merchant.values() if v.get('category'))
-        if all_categories:
-            print(f"\nAvailable categories: {', '.join(sorted(all_categories))}")
+def _suggest_available_values(by_merchant, has_category, has_tags, has_month, month_idx=None):
+    """Suggest available filter values when no matches found.
 
-    if has_tags:
-        all_tags = set()
-        for data in by_merchant.values():
+    Collects everything in a single pass over by_merchant; the month
+    filter's inverted index is reused when the caller already built it.
+    """
+    all_categories = set()
+    all_tags = set()
+    all_months = set(month_idx) if month_idx is not None else set()
+    scan_months = has_month and month_idx is None
+
+    for data in by_merchant.values():
+        if has_category and data.get('category'):
+            all_categories.add(data['category'])
+        if has_tags:
             all_tags.update(data.get('tags', []))
-        if all_tags:
-            print(f"\nAvailable tags: {', '.join(sorted(all_tags))}")
-
-    if has_month:
-        all_months = set()
-        for data in by_merchant.values():
+        if scan_months:
             for txn in data.get('transactions', []):
                 if txn.get('month'):
                     all_months.add(txn['month'])
-        if all_months:
-            print(f"\nAvailable months: {', '.join(sorted(all_months))}")
+
+    if has_category and all_categories:
+        print(f"\nAvailable categories: {', '.join(sorted(all_categories))}")
+    if has_tags and all_tags:
+        print(f"\nAvailable tags: {', '.join(sorted(all_tags))}")
+    if has_month and all_months:
+        print(f"\nAvailable months: {', '.join(sorted(all_months))}")
 
 
 def _format_match_expr(pattern):
     """Convert a regex pattern to a readable match expression."""
-    import re
     # If pattern already uses function syntax, return as-is
-    if re.match(r'^(normalized|anyof|startswith|fuzzy|contains|regex)\s*\(', pattern):
+    if _MATCH_FN_RE.match(pattern):
         return pattern
     # If it looks like a simple word match, show as contains()
-    if re.match(r'^[A-Z0-9\s]+$', pattern):
+    if _SIMPLE_UPPER_RE.match(pattern):
         # Simple uppercase pattern - convert to contains()
         return f'contains("{pattern}")'
     elif '\\s' in pattern or '(?!' in pattern or '|' in pattern or '[' in pattern:
@@ -425,11 +526,10 @@ def _format_match_expr(pattern):
 
 def _get_function_explanations(pattern):
     """Get contextual explanations for functions used in a match expression."""
-    import re
     explanations = []
 
     # Check for normalized()
-    norm_match = re.search(r'normalized\s*\(\s*"([^"]+)"\s*\)', pattern)
+    norm_match = _NORMALIZED_ARG_RE.search(pattern)
     if norm_match:
         arg = norm_match.group(1)
         explanations.append(
@@ -438,7 +538,7 @@ def _get_function_explanations(pattern):
         )
 
     # Check for anyof()
-    anyof_match = re.search(r'anyof\s*\(([^)]+)\)', pattern)
+    anyof_match = _ANYOF_ARGS_RE.search(pattern)
     if anyof_match:
         args = anyof_match.group(1)
         explanations.append(
@@ -446,7 +546,7 @@ def _get_function_explanations(pattern):
         )
 
     # Check for startswith()
-    starts_match = re.search(r'startswith\s*\(\s*"([^"]+)"\s*\)', pattern)
+    starts_match = _STARTSWITH_ARG_RE.search(pattern)
     if starts_match:
         arg = starts_match.group(1)
         explanations.append(
@@ -454,7 +554,7 @@ def _get_function_explanations(pattern):
         )
 
     # Check for fuzzy()
-    fuzzy_match = re.search(r'fuzzy\s*\(\s*"([^"]+)"(?:\s*,\s*([0-9.]+))?\s*\)', pattern)
+    fuzzy_match = _FUZZY_ARGS_RE.search(pattern)
     if fuzzy_match:
         arg = fuzzy_match.group(1)
         threshold = fuzzy_match.group(2) or '0.80'
@@ -464,7 +564,7 @@ def _get_function_explanations(pattern):
         )
 
     # Check for list comprehension (cross-source query)
-    list_comp = re.search(r'\[.*\bfor\b\s+\w+\s+\bin\b\s+(\w+)', pattern)
+    list_comp = _LIST_COMP_RE.search(pattern)
     if list_comp:
         source = list_comp.group(1)
         explanations.append(
@@ -472,8 +572,8 @@ def _get_function_explanations(pattern):
         )
 
     # Check for aggregation functions with generators (cross-source query)
-    for func in ['any', 'sum', 'len', 'next']:
-        func_match = re.search(rf'\b{func}\s*\(.*\bfor\b\s+\w+\s+\bin\b\s+(\w+)', pattern)
+    for func, func_re in _AGG_FUNC_RES.items():
+        func_match = func_re.search(pattern)
         if func_match:
             source = func_match.group(1)
             if func == 'any':
@@ -504,10 +604,9 @@ def _get_function_explanations(pattern):
 
 def _print_description_explanation(query, trace, output_format, verbose):
     """Print explanation for how a raw description matches."""
-    import json
-
     if output_format == 'json':
-        print(json.dumps(trace, indent=2))
+        json.dump(trace, sys.stdout, indent=2)
+        print()
     elif output_format == 'markdown':
         print(f"## Description Trace: `{query}`")
         print()
@@ -578,14 +677,25 @@ def _print_description_explanation(query, trace, output_format, verbose):
         print()
 
 
+# Month-string -> datetime cache for _get_matching_views. Ledgers only
+# span a handful of months, so integer slicing plus this dict replaces a
+# strptime call per transaction per explained merchant.
+_MONTH_DT_CACHE = {}
+
+
+def _month_datetime(month):
+    """Return a datetime for the 15th of a 'YYYY-MM' month (cached)."""
+    dt = _MONTH_DT_CACHE.get(month)
+    if dt is None:
+        dt = _MONTH_DT_CACHE[month] = datetime(int(month[:4]), int(month[5:7]), 15)
+    return dt
+
+
 def _get_matching_views(data, views_config, num_months):
     """Evaluate which views a merchant matches and return details."""
     if not views_config:
         return []
 
-    from datetime import datetime
-    from ..section_engine import evaluate_section_filter, evaluate_variables
-
     # Calculate primitives
     months_active = data.get('months_active', 1)
     total = data.get('total', 0)
@@ -602,7 +712,7 @@ def _get_matching_views(data, views_config, num_months):
         for txn in existing_txns:
             transactions.append({
                 'amount': txn['amount'],
-                'date': datetime.strptime(txn['month'] + '-15', '%Y-%m-%d'),
+                'date': _month_datetime(txn['month']),
                 'category': category,
                 'subcategory': subcategory,
                 'tags': tags,
@@ -653,15 +763,14 @@ def _get_matching_views(data, views_config, num_months):
 
 def _print_merchant_explanation(name, data, output_format, verbose, num_months, views_config=None):
     """Print explanation for a single merchant."""
-    import json
-
-    # Get matching views
-    matching_views = _get_matching_views(data, views_config, num_months)
+    # Get matching views (skip the call entirely when no views.rules)
+    matching_views = _get_matching_views(data, views_config, num_months) if views_config else []
 
     if output_format == 'json':
         merchant_json = build_merchant_json(name, data, verbose)
         merchant_json['views'] = matching_views
-        print(json.dumps(merchant_json, indent=2))
+        json.dump(merchant_json, sys.stdout, indent=2)
+        print()
     elif output_format == 'markdown':
         reasoning = data.get('reasoning', {})
         print(f"## {name}")
@@ -678,20 +787,22 @@ def _print_merchant_explanation(name, data, output_format, verbose, num_months,
         if verbose >= 1:
             # Show raw description variations
             raw_descs = data.get('raw_descriptions', {})
-            if raw_descs and len(raw_descs) > 0:
-                sorted_descs = sorted(raw_descs.items(), key=lambda x: -x[1])
+            num_descs = len(raw_descs)
+            if num_descs > 0:
                 if verbose >= 2:
                     # -vv: show all variations
-                    print(f"\n**Description Variations ({len(raw_descs)}):**")
+                    sorted_descs = sorted(raw_descs.items(), key=itemgetter(1), reverse=True)
+                    print(f"\n**Description Variations ({num_descs}):**")
                     for desc, count in sorted_descs:
                         print(f"  - `{desc}` ({count})")
                 else:
-                    # -v: show top 10 variations
-                    print(f"\n**Description Variations ({len(raw_descs)} unique):**")
-                    for desc, count in sorted_descs[:10]:
+                    # -v: heap-select the top 10 instead of sorting all
+                    top_descs = heapq.nlargest(10, raw_descs.items(), key=itemgetter(1))
+                    print(f"\n**Description Variations ({num_descs} unique):**")
+                    for desc, count in top_descs:
                         print(f"  - `{desc}` ({count})")
-                    if len(raw_descs) > 10:
-                        print(f"  - ... and {len(raw_descs) - 10} more (use -vv to see all)")
+                    if num_descs > 10:
+                        print(f"  - ... and {num_descs - 10} more (use -vv to see all)")
 
             trace = reasoning.get('trace', [])
             if trace:
@@ -717,6 +828,7 @@ def _print_merchant_explanation(name, data, output_format, verbose, num_months,
         print()
     else:
         # Text format
+        reasoning = data.get('reasoning', {})
         category = data.get('category', 'Unknown')
         subcategory = data.get('subcategory', 'Unknown')
         print(f"{name}")
@@ -747,30 +859,36 @@ def _print_merchant_explanation(name, data, output_format, verbose, num_months,
         if verbose >= 1:
             # Show raw description variations
             raw_descs = data.get('raw_descriptions', {})
-            if raw_descs and len(raw_descs) > 0:
-                sorted_descs = sorted(raw_descs.items(), key=lambda x: -x[1])
+            num_descs = len(raw_descs)
+            if num_descs > 0:
                 if verbose >= 2:
                     # -vv: show all variations
+                    sorted_descs = sorted(raw_descs.items(), key=itemgetter(1), reverse=True)
                     print()
-                    print(f"  Description variations ({len(raw_descs)}):")
+                    print(f"  Description variations ({num_descs}):")
                     for desc, count in sorted_descs:
                         print(f"    {desc} ({count})")
                 else:
-                    # -v: show top 10 variations
+                    # -v: heap-select the top 10 instead of sorting all
+                    top_descs = heapq.nlargest(10, raw_descs.items(), key=itemgetter(1))
                     print()
-                    print(f"  Description variations ({len(raw_descs)} unique):")
-                    for desc, count in sorted_descs[:10]:
+                    print(f"  Description variations ({num_descs} unique):")
+                    for desc, count in top_descs:
                         print(f"    {desc} ({count})")
-                    if len(raw_descs) > 10:
-                        print(f"    ... and {len(raw_descs) - 10} more (use -vv to see all)")
+                    if num_descs > 10:
+                        print(f"    ... and {num_descs - 10} more (use -vv to see all)")
 
             # Show transactions with amounts
             transactions = data.get('transactions', [])
-            if transactions:
+            num_txns = len(transactions)
+            if num_txns > 0:
                 print()
-                print(f"  Transactions ({len(transactions)}):")
-                sorted_txns = sorted(transactions, key=lambda x: x.get('date', ''), reverse=True)
-                display_txns = sorted_txns if verbose >= 2 else sorted_txns[:10]
+                print(f"  Transactions ({num_txns}):")
+                if verbose >= 2:
+                    display_txns = sorted(transactions, key=lambda x: x.get('date', ''), reverse=True)
+                else:
+                    # Only 10 are shown - heap-select instead of sorting all
+                    display_txns = heapq.nlargest(10, transactions, key=lambda x: x.get('date', ''))
                 for txn in display_txns:
                     date = txn.get('date', '')
                     amount = txn.get('amount', 0)
@@ -780,8 +898,8 @@ def _print_merchant_explanation(name, data, output_format, verbose, num_months,
                         print(f"    {date}  {C.GREEN}{amount:>10.2f}{C.RESET}  {desc}")
                     else:
                         print(f"    {date}  {amount:>10.2f}  {desc}")
-                if len(transactions) > 10 and verbose < 2:
-                    print(f"    ... and {len(transactions) - 10} more (use -vv to see all)")
+                if num_txns > 10 and verbose < 2:
+                    print(f"    ... and {num_txns - 10} more (use -vv to see all)")
 
             trace = reasoning.get('trace', [])
             if trace:
@@ -835,39 +953,37 @@ def _print_explain_summary(stats, verbose):
     print("=" * 60)
     print()
 
-    # Group by category
+    # Group by category, accumulating each category's total in the same
+    # pass so the sorts and headers below never re-walk the merchant lists
     by_category = {}
     for name, data in by_merchant.items():
         cat = data.get('category', 'Unknown')
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append((name, data))
+        entry = by_category.get(cat)
+        if entry is None:
+            entry = by_category[cat] = [0.0, []]
+        entry[0] += data.get('total', 0)
+        entry[1].append((name, data))
 
     # Sort categories by total spend
-    sorted_categories = sorted(
-        by_category.items(),
-        key=lambda x: sum(d.get('total', 0) for _, d in x[1]),
-        reverse=True
-    )
+    sorted_categories = sorted(by_category.items(), key=lambda kv: kv[1][0], reverse=True)
 
-    for category, merchants in sorted_categories:
-        total = sum(d.get('total', 0) for _, d in merchants)
-        print(f"{category} ({len(merchants)} merchants, ${total:,.0f} YTD)")
+    for category, (total, merchants) in sorted_categories:
+        num_merchants = len(merchants)
+        print(f"{category} ({num_merchants} merchants, ${total:,.0f} YTD)")
 
-        sorted_merchants = sorted(merchants, key=lambda x: x[1].get('total', 0), reverse=True)
+        merchants.sort(key=lambda x: x[1].get('total', 0), reverse=True)
 
         # Show top 5 or all if verbose
-        display_count = len(sorted_merchants) if verbose >= 1 else min(5, len(sorted_merchants))
+        display_count = num_merchants if verbose >= 1 else min(5, num_merchants)
 
-        for name, data in sorted_merchants[:display_count]:
+        for name, data in merchants[:display_count]:
             subcategory = data.get('subcategory', '')
             months = data.get('months_active', 0)
 
             print(f"  {name:<26} {subcategory} ({months}/{num_months} months)")
 
-        if len(sorted_merchants) > display_count:
-            remaining = len(sorted_merchants) - display_count
-            print(f"  ... and {remaining} more")
+        if num_merchants > display_count:
+            print(f"  ... and {num_merchants - display_count} more")
 
         print()
 
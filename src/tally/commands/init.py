@@ -8,7 +8,6 @@ import sys
 from ..colors import C, supports_color
 from ..cli_utils import init_config
 from ..migrations import migrate_csv_to_rules
-from ..templates import STARTER_SETTINGS, STARTER_MERCHANTS, STARTER_VIEWS
 
 
 def cmd_init(args):
@@ -33,12 +32,16 @@ def cmd_init(args):
     print(f"Initializing budget directory: {C.BOLD}{rel_target}{C.RESET}")
     print()
 
-    # Check for old merchant_categories.csv BEFORE init_config creates new files
+    # Check for old merchant_categories.csv BEFORE init_config creates new files.
+    # One scandir pass replaces the per-file exists probes on config_dir.
     config_dir = os.path.join(target_dir, 'config')
     old_csv = os.path.join(config_dir, 'merchant_categories.csv')
-    new_rules = os.path.join(config_dir, 'merchants.rules')
+    try:
+        config_entries = {e.name for e in os.scandir(config_dir) if e.is_file(follow_symlinks=False)}
+    except (FileNotFoundError, NotADirectoryError):
+        config_entries = set()
 
-    if os.path.exists(old_csv) and not os.path.exists(new_rules):
+    if 'merchant_categories.csv' in config_entries and 'merchants.rules' not in config_entries:
         # Check if CSV has actual rules (not just header/comments)
         has_rules = False
         try:
@@ -61,10 +64,14 @@ def cmd_init(args):
 
     created, skipped = init_config(target_dir)
 
-    # Update settings.yaml to add views_file if missing
+    # Update settings.yaml to add views_file if missing. Rescan once since
+    # init_config may have just created these files.
     settings_path = os.path.join(config_dir, 'settings.yaml')
-    views_rules = os.path.join(config_dir, 'views.rules')
-    if os.path.exists(settings_path) and os.path.exists(views_rules):
+    try:
+        config_entries = {e.name for e in os.scandir(config_dir) if e.is_file(follow_symlinks=False)}
+    except (FileNotFoundError, NotADirectoryError):
+        config_entries = set()
+    if 'settings.yaml' in config_entries and 'views.rules' in config_entries:
         try:
             with open(settings_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -106,7 +113,7 @@ def cmd_init(args):
     if os.sep == '/':
         rel_settings = './' + rel_settings
         rel_data = './' + rel_data
-    if os.path.exists(settings_path):
+    if 'settings.yaml' in config_entries:
         try:
             with open(settings_path, 'r') as f:
                 settings = yaml.safe_load(f) or {}
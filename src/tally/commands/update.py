@@ -81,8 +81,7 @@ def cmd_update(args):
         sys.exit(0)
 
     # Check if running from source (can't self-update)
-    import sys as _sys
-    if not getattr(_sys, 'frozen', False):
+    if not getattr(sys, 'frozen', False):
         print(f"\n✗ Cannot self-update when running from source. Use: uv tool upgrade tally")
         sys.exit(1)
 
@@ -214,6 +214,9 @@ def load_config(config_dir, settings_file='settings.yaml'):
     # Load merchants file (optional - merchants_file in settings.yaml)
     # This is the new .rules format; merchant_categories.csv is deprecated
     merchants_file = config.get('merchants_file')
+    # Remember whether the key was present so the CSV migration doesn't
+    # have to re-read settings.yaml just to grep for it
+    config['_has_merchants_key'] = 'merchants_file' in config
     if merchants_file:
         budget_dir = os.path.dirname(config_dir)
         merchants_path = os.path.join(budget_dir, merchants_file)
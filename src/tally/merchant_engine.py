@@ -115,7 +115,6 @@ def calculate_specificity(rule: MerchantRule) -> Tuple[int, int, int, int]:
 
 def _extract_pattern_length(match_expr: str) -> int:
     """Extract total length of pattern strings in a match expression."""
-    import re
     # Find all quoted strings in the expression
     strings = re.findall(r'"([^"]*)"', match_expr)
     strings += re.findall(r"'([^']*)'", match_expr)
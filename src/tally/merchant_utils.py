@@ -106,24 +106,22 @@ def _expr_to_regex(match_expr: str) -> str:
         contains("COSTCO") and amount > 200 -> COSTCO (amount ignored in regex)
         normalized("UBEREATS") -> normalized("UBEREATS")  # preserved for expr parser
     """
-    import re as regex_module
-
     # Check if expression uses new functions that need to be preserved
-    if regex_module.search(r'\b(normalized|anyof|startswith|fuzzy)\s*\(', match_expr):
+    if re.search(r'\b(normalized|anyof|startswith|fuzzy)\s*\(', match_expr):
         # Return full expression - will be handled by expression parser
         return match_expr
 
     # Extract pattern from contains("...") or regex("...")
-    contains_match = regex_module.search(r'contains\s*\(\s*["\']([^"\']+)["\']\s*\)', match_expr)
+    contains_match = re.search(r'contains\s*\(\s*["\']([^"\']+)["\']\s*\)', match_expr)
     if contains_match:
         return contains_match.group(1)
 
-    regex_match = regex_module.search(r'regex\s*\(\s*["\']([^"\']+)["\']\s*\)', match_expr)
+    regex_match = re.search(r'regex\s*\(\s*["\']([^"\']+)["\']\s*\)', match_expr)
     if regex_match:
         return regex_match.group(1)
 
     # If no function found, try to extract a quoted string
-    quoted_match = regex_module.search(r'["\']([^"\']+)["\']', match_expr)
+    quoted_match = re.search(r'["\']([^"\']+)["\']', match_expr)
     if quoted_match:
         return quoted_match.group(1)
 
@@ -372,8 +370,6 @@ def diagnose_rules(csv_path=None):
         - rules_with_tags: Count of rules that have tags
         - unique_tags: Set of all unique tags across all rules
     """
-    import re
-
     result = {
         'user_rules_path': csv_path,
         'user_rules_exists': False,
@@ -534,6 +530,13 @@ def normalize_merchant(
         When using .rules files with let:/field: directives, match_info
         also includes 'extra_fields' from the matched rule.
     """
+    # Fast path: with no rules, no transforms, and no cached engine,
+    # nothing can match - every transaction comes back Unknown. Skip the
+    # context build and rule scan entirely; this is the common case for
+    # 'tally discover' before any rules have been written.
+    if not rules and not transforms and _cached_engine is None:
+        return (extract_merchant_name(description), 'Unknown', 'Unknown', None)
+
     from tally import expr_parser
 
     # Build transaction context for transforms
@@ -684,7 +687,6 @@ def normalize_merchant(
 
 def _is_expression_pattern(pattern: str) -> bool:
     """Check if a pattern is an expression (uses function syntax) vs a regex."""
-    import re
     # Expression patterns start with:
     # - Function calls like contains(), normalized(), extract(), etc.
     # - Field access like field.txn_type
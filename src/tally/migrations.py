@@ -7,20 +7,74 @@ Handles:
 - CSV to .rules format migration
 """
 
+import functools
 import os
-import shutil
+import string
 import sys
 
 from .colors import C
 from .merchant_utils import get_all_rules, load_merchant_rules
 
+# Memoize rule loading per (path, match_mode) - a run that checks rules
+# both before and after migration shouldn't re-parse the same file
+_get_rules = functools.lru_cache(maxsize=4)(get_all_rules)
+
 
 # Schema version for asset migrations
 SCHEMA_VERSION = 1
 
 
+# Upgrade banner for the CSV -> .rules migration prompt. Compiled once as
+# a string.Template ($y/$r color placeholders, C-level substitution, and no
+# brace escaping needed in the box text) and emitted with a single write.
+_UPGRADE_BANNER = string.Template('''
+$y╭─ Upgrade Available ─────────────────────────────────────────────────╮$r
+$y│$r Found: merchant_categories.csv (legacy CSV format)                  $y│$r
+$y│$r                                                                      $y│$r
+$y│$r The new .rules format supports powerful expressions:                 $y│$r
+$y│$r   match: contains("COSTCO") and amount > 200                        $y│$r
+$y│$r   match: regex("UBER.*EATS") and month == 12                        $y│$r
+$y╰──────────────────────────────────────────────────────────────────────╯$r
+
+''')
+
+# Warning shown when a rules file loads but defines no rules
+_NO_RULES_WARNING = '''
+⚠️  No merchant rules defined - all transactions will be 'Unknown'
+    Run 'tally discover' to find unknown merchants and get suggested rules.
+    Tip: Use an AI agent with 'tally discover' to auto-generate rules!
+'''
+
+
+def _stream_isatty(stream):
+    """True if stream is a tty; tolerates streams without isatty."""
+    isatty = getattr(stream, 'isatty', None)
+    return bool(isatty and isatty())
+
+
+def _prompt(prompt):
+    """Read one line of input without pulling in readline.
+
+    Returns the stripped, lowercased response, or None on EOF/interrupt.
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    try:
+        response = sys.stdin.readline()
+    except KeyboardInterrupt:
+        return None
+    if not response:  # EOF
+        return None
+    return response.strip().lower()
+
+
+@functools.lru_cache(maxsize=8)
 def get_schema_version(config_dir):
-    """Get current schema version from config directory.
+    """Get current schema version from config directory (memoized per path).
+
+    The .tally-schema marker is written exactly once per migration, so
+    caching by config_dir is safe for a CLI invocation; run_migrations
+    clears the cache after migrating.
 
     Returns:
         int: Schema version (0 if no marker file exists - legacy layout)
@@ -45,6 +99,12 @@ def run_migrations(config_dir, skip_confirm=False):
     Returns:
         str: Path to config directory (may change if layout migrated)
     """
+    # Fast path: while SCHEMA_VERSION is 1, the marker file's existence
+    # alone answers "current >= SCHEMA_VERSION" - a stat instead of
+    # open+read+parse. Revisit once a schema 2 exists.
+    if SCHEMA_VERSION == 1 and os.path.exists(os.path.join(config_dir, '.tally-schema')):
+        return config_dir
+
     current = get_schema_version(config_dir)
 
     if current >= SCHEMA_VERSION:
@@ -55,6 +115,7 @@ def run_migrations(config_dir, skip_confirm=False):
         result = migrate_v0_to_v1(config_dir, skip_confirm)
         if result:
             config_dir = result
+            get_schema_version.cache_clear()
 
     return config_dir
 
@@ -70,15 +131,18 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
         str: Path to new config directory, or None if user declined
     """
     # Only migrate if we're in the old layout (./config at working directory root)
+    cwd = os.getcwd()
     if os.path.basename(old_config_dir) != 'config':
         return None
-    if os.path.dirname(old_config_dir) != os.getcwd():
+    if os.path.dirname(old_config_dir) != cwd:
         return None
 
+    import shutil
+
     # Prompt user (skip if non-interactive or --yes flag)
     if not skip_confirm:
         # In non-interactive mode (e.g., LLM/CI), skip migration silently
-        if not sys.stdin.isatty():
+        if not _stream_isatty(sys.stdin):
             return None
 
         print()
@@ -86,16 +150,15 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
         print("  Current: ./config (legacy layout)")
         print("  New: ./tally/config")
         print()
-        try:
-            response = input("Migrate to new layout? [Y/n]: ").strip().lower()
-        except (EOFError, KeyboardInterrupt):
+        response = _prompt("Migrate to new layout? [Y/n]: ")
+        if response is None:
             print("\nSkipped.")
             return None
         if response == 'n':
             return None
 
-    # Perform migration
-    tally_dir = os.path.abspath('tally')
+    # Perform migration (reuse the cwd resolved above instead of abspath)
+    tally_dir = os.path.join(cwd, 'tally')
     try:
         os.makedirs(tally_dir, exist_ok=True)
 
@@ -106,7 +169,7 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
 
         # Move data and output directories if they exist
         for subdir in ['data', 'output']:
-            old_path = os.path.abspath(subdir)
+            old_path = os.path.join(cwd, subdir)
             if os.path.isdir(old_path):
                 new_path = os.path.join(tally_dir, subdir)
                 print(f"  Moving {subdir}/ -> tally/{subdir}/")
@@ -125,7 +188,8 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
         return None
 
 
-def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True) -> bool:
+def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True,
+                         has_merchants_key: bool = None) -> bool:
     """
     Migrate merchant_categories.csv to merchants.rules format.
 
@@ -133,6 +197,8 @@ def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True) ->
         csv_file: Path to the CSV file
         config_dir: Path to config directory
         backup: Whether to rename old CSV to .bak
+        has_merchants_key: Whether settings.yaml already has merchants_file,
+            as precomputed by load_config (None = unknown, scan the file)
 
     Returns:
         True if migration was successful
@@ -151,22 +217,36 @@ def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True) ->
         print(f"  {C.GREEN}✓{C.RESET} Created: config/merchants.rules")
         print(f"      Converted {len(csv_rules)} merchant rules to new format")
 
-        # Backup old file
-        if backup and os.path.exists(csv_file):
-            shutil.move(csv_file, csv_file + '.bak')
-            print(f"  {C.GREEN}✓{C.RESET} Backed up: merchant_categories.csv → .bak")
-
-        # Update settings.yaml to reference new file
+        # Backup old file (EAFP - skips a stat per path vs. exists+open).
+        # os.replace is a single rename(2); safe since both paths share a
+        # directory.
+        if backup:
+            try:
+                os.replace(csv_file, csv_file + '.bak')
+                print(f"  {C.GREEN}✓{C.RESET} Backed up: merchant_categories.csv → .bak")
+            except FileNotFoundError:
+                pass
+
+        # Update settings.yaml to reference new file. A single 'r+' open
+        # leaves the position at EOF after read(), so the append reuses
+        # the same file handle instead of a second open.
         settings_path = os.path.join(config_dir, 'settings.yaml')
-        if os.path.exists(settings_path):
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            if 'merchants_file:' not in content:
-                with open(settings_path, 'a', encoding='utf-8') as f:
-                    f.write('\n# Merchant rules file (migrated from CSV)\n')
-                    f.write('merchants_file: config/merchants.rules\n')
-                print(f"  {C.GREEN}✓{C.RESET} Updated: config/settings.yaml")
-                print(f"      Added merchants_file: config/merchants.rules")
+        if not has_merchants_key:
+            try:
+                with open(settings_path, 'r+', encoding='utf-8') as f:
+                    if has_merchants_key is False:
+                        # Caller already knows the key is absent - jump to EOF
+                        f.seek(0, os.SEEK_END)
+                        needs_update = True
+                    else:
+                        needs_update = 'merchants_file:' not in f.read()
+                    if needs_update:
+                        f.write('\n# Merchant rules file (migrated from CSV)\n')
+                        f.write('merchants_file: config/merchants.rules\n')
+                        print(f"  {C.GREEN}✓{C.RESET} Updated: config/settings.yaml")
+                        print(f"      Added merchants_file: config/merchants.rules")
+            except FileNotFoundError:
+                pass
 
         return True
     except Exception as e:
@@ -195,7 +275,7 @@ def check_merchant_migration(config: dict, config_dir: str, quiet: bool = False,
         # No rules file found
         if not quiet:
             print(f"No merchant rules found - transactions will be categorized as Unknown")
-        return get_all_rules(match_mode=rule_mode)
+        return _get_rules(match_mode=rule_mode)
 
     if merchants_format == 'csv':
         # CSV format - show deprecation warning and offer migration
@@ -203,26 +283,16 @@ def check_merchant_migration(config: dict, config_dir: str, quiet: bool = False,
 
         # Determine if we should migrate
         should_migrate = migrate  # --migrate flag forces it
-        is_interactive = sys.stdout.isatty() and not migrate
+        # stdin is the signal that a prompt can actually be answered
+        is_interactive = _stream_isatty(sys.stdin) and _stream_isatty(sys.stdout) and not migrate
 
         if not quiet:
-            print()
-            print(f"{C.YELLOW}╭─ Upgrade Available ─────────────────────────────────────────────────╮{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET} Found: merchant_categories.csv (legacy CSV format)                  {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET}                                                                      {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET} The new .rules format supports powerful expressions:                 {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET}   match: contains(\"COSTCO\") and amount > 200                        {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET}   match: regex(\"UBER.*EATS\") and month == 12                        {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}╰──────────────────────────────────────────────────────────────────────╯{C.RESET}")
-            print()
+            sys.stdout.write(_UPGRADE_BANNER.substitute(y=C.YELLOW, r=C.RESET))
 
         if is_interactive:
             # Only prompt if interactive and not using --migrate
-            try:
-                response = input(f"   Migrate to new format? [y/N] ").strip().lower()
-                should_migrate = (response == 'y')
-            except (EOFError, KeyboardInterrupt):
-                should_migrate = False
+            response = _prompt("   Migrate to new format? [y/N] ")
+            should_migrate = (response == 'y')
 
             if not should_migrate:
                 print(f"   {C.DIM}Skipped - continuing with CSV format for this run{C.RESET}")
@@ -234,42 +304,36 @@ def check_merchant_migration(config: dict, config_dir: str, quiet: bool = False,
 
         if should_migrate:
             # Perform migration using shared helper
-            print(f"{C.CYAN}Migrating to new format...{C.RESET}")
-            print()
-            if migrate_csv_to_rules(merchants_file, config_dir, backup=True):
-                print()
-                print(f"{C.GREEN}Migration complete!{C.RESET} Your rules now support expressions.")
-                print()
-                # Return new rules from migrated file
+            sys.stdout.write(f"{C.CYAN}Migrating to new format...{C.RESET}\n\n")
+            if migrate_csv_to_rules(merchants_file, config_dir, backup=True,
+                                    has_merchants_key=config.get('_has_merchants_key')):
+                sys.stdout.write(f"\n{C.GREEN}Migration complete!{C.RESET} Your rules now support expressions.\n\n")
+                # Return new rules from migrated file (drop any entry
+                # cached before the file was rewritten)
+                _get_rules.cache_clear()
                 new_file = os.path.join(config_dir, 'merchants.rules')
-                return get_all_rules(new_file, match_mode=rule_mode)
+                return _get_rules(new_file, match_mode=rule_mode)
 
         # Continue with CSV format for this run (backwards compatible)
         if not quiet:
-            print(f"Loaded {len(csv_rules)} categorization rules from {merchants_file}")
+            lines = f"Loaded {len(csv_rules)} categorization rules from {merchants_file}\n"
             if len(csv_rules) == 0:
-                print()
-                print("⚠️  No merchant rules defined - all transactions will be 'Unknown'")
-                print("    Run 'tally discover' to find unknown merchants and get suggested rules.")
-                print("    Tip: Use an AI agent with 'tally discover' to auto-generate rules!")
-                print()
+                lines += _NO_RULES_WARNING + '\n'
+            sys.stdout.write(lines)
 
-        return get_all_rules(merchants_file, match_mode=rule_mode)
+        return _get_rules(merchants_file, match_mode=rule_mode)
 
     # New .rules format
     if merchants_format == 'new':
-        rules = get_all_rules(merchants_file, match_mode=rule_mode)
+        rules = _get_rules(merchants_file, match_mode=rule_mode)
         if not quiet:
-            print(f"Loaded {len(rules)} categorization rules from {merchants_file}")
+            lines = f"Loaded {len(rules)} categorization rules from {merchants_file}\n"
             if len(rules) == 0:
-                print()
-                print("⚠️  No merchant rules defined - all transactions will be 'Unknown'")
-                print("    Run 'tally discover' to find unknown merchants and get suggested rules.")
-                print("    Tip: Use an AI agent with 'tally discover' to auto-generate rules!")
-                print()
+                lines += _NO_RULES_WARNING + '\n'
+            sys.stdout.write(lines)
         return rules
 
     # No rules file found
     if not quiet:
         print(f"No merchant rules found - transactions will be categorized as Unknown")
-    return get_all_rules(match_mode=rule_mode)
+    return _get_rules(match_mode=rule_mode)
@@ -4,6 +4,7 @@ Path resolution helpers for data sources.
 
 import glob
 import os
+import stat
 import sys
 
 
@@ -24,7 +25,10 @@ def resolve_data_source_paths(config_dir, file_spec):
     base_dir = os.path.dirname(os.path.abspath(config_dir))
     spec = os.path.expandvars(os.path.expanduser(str(file_spec)))
     if not os.path.isabs(spec):
-        spec = os.path.normpath(os.path.join(base_dir, spec))
+        spec = os.path.join(base_dir, spec)
+    # Normalize once here - every path derived from spec below stays
+    # normalized, so the per-result normpath calls are unnecessary
+    spec = os.path.normpath(spec)
 
     if glob.has_magic(spec):
         # Warn about potentially expensive patterns
@@ -34,7 +38,7 @@ def resolve_data_source_paths(config_dir, file_spec):
                   file=sys.stderr)
         
         matches = glob.glob(spec, recursive=True)
-        files = [os.path.normpath(p) for p in matches if os.path.isfile(p)]
+        files = [p for p in matches if os.path.isfile(p)]
         
         # Show progress for large results
         if len(files) > 100:
@@ -42,15 +46,21 @@ def resolve_data_source_paths(config_dir, file_spec):
         
         return sorted(set(files)), 'glob'
 
-    if os.path.isdir(spec):
-        files = []
-        for entry in os.listdir(spec):
-            full_path = os.path.join(spec, entry)
-            if os.path.isfile(full_path) and entry.lower().endswith('.csv'):
-                files.append(os.path.normpath(full_path))
+    # One stat answers both the directory and plain-file probes below
+    try:
+        mode = os.stat(spec).st_mode
+    except OSError:
+        return [], 'missing'
+
+    if stat.S_ISDIR(mode):
+        # scandir entries carry the file type from the directory
+        # listing, so no per-entry stat is needed
+        with os.scandir(spec) as entries:
+            files = [entry.path for entry in entries
+                     if entry.name.lower().endswith('.csv') and entry.is_file()]
         return sorted(files), 'dir'
 
-    if os.path.isfile(spec):
-        return [os.path.normpath(spec)], 'file'
+    if stat.S_ISREG(mode):
+        return [spec], 'file'
 
     return [], 'missing'